@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Job, OutboxMessage
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'recipients', 'status', 'attempts',
+                    'next_attempt', 'created', 'sent')
+    list_filter = ('status',)
+    exclude = ('payload',)
+    readonly_fields = ('subject', 'recipients', 'attempts', 'lease',
+                       'last_error', 'created', 'sent')
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'queue', 'name', 'status', 'attempts',
+                    'run_after', 'created')
+    list_filter = ('queue', 'status')
+    readonly_fields = ('slot', 'lease_until', 'last_error', 'created')
+
+
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
+
+admin.site.register(Job, JobAdmin)
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.utils.module_loading import autodiscover_modules
+
+from . import template_profiling
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Задачи регистрируются при импорте модулей tasks всех приложений.
+        autodiscover_modules('tasks')
+        if settings.TEMPLATE_PROFILING:
+            template_profiling.enable()
@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from posts.notifications import unread_count
+
+
+def unread_notifications(request):
+    """Счётчик для шапки; кеш читается, только если шаблон его выводит."""
+    def count():
+        user = request.user
+        return unread_count(user.pk) if user.is_authenticated else 0
+
+    return {'unread_notifications': SimpleLazyObject(count)}
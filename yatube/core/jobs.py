@@ -0,0 +1,132 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+JOB_LEASE = 10 * 60
+JOB_RETRY_DELAY = 30
+JOB_MAX_RETRY_DELAY = 60 * 60
+
+
+def task(queue='default', max_attempts=5):
+    """Регистрирует функцию как фоновую задачу.
+
+    func.delay(*args, **kwargs) ставит задачу в очередь внутри текущей
+    транзакции: если запрос откатится, задача тоже не появится. Аргументы
+    должны сериализоваться в JSON.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        TASKS[name] = func
+
+        @wraps(func)
+        def delay(*args, **kwargs):
+            return Job.objects.create(
+                queue=queue, name=name, max_attempts=max_attempts,
+                payload=json.dumps({'args': args, 'kwargs': kwargs}),
+                run_after=timezone.now())
+
+        func.delay = delay
+        return func
+
+    return decorator
+
+
+def queue_limits():
+    return settings.JOB_QUEUES
+
+
+def release_expired(queue):
+    """Возвращает в очередь задачи обработчиков, которые не дожили до конца
+    аренды."""
+    Job.objects.filter(
+        queue=queue, status=Job.STATUS_RUNNING,
+        lease_until__lt=timezone.now()
+    ).update(status=Job.STATUS_QUEUED, slot=None, lease_until=None)
+
+
+def claim(queue):
+    """Забирает следующую задачу очереди, если в ней есть свободный слот.
+
+    Аналог SKIP LOCKED для SQLite: задача забирается UPDATE с условием на
+    статус, а слот защищён частичным уникальным индексом. Проигравший
+    гонку обработчик просто пробует следующую задачу или слот.
+    """
+    limit = queue_limits().get(queue, 1)
+    busy = set(Job.objects.filter(
+        queue=queue, status=Job.STATUS_RUNNING
+    ).values_list('slot', flat=True))
+    free = [slot for slot in range(limit) if slot not in busy]
+    while free:
+        now = timezone.now()
+        job_id = Job.objects.filter(
+            queue=queue, status=Job.STATUS_QUEUED, run_after__lte=now
+        ).order_by('run_after', 'pk').values_list('pk', flat=True).first()
+        if job_id is None:
+            return None
+        try:
+            with transaction.atomic():
+                claimed = Job.objects.filter(
+                    pk=job_id, status=Job.STATUS_QUEUED
+                ).update(
+                    status=Job.STATUS_RUNNING, slot=free[0],
+                    lease_until=now + timedelta(seconds=JOB_LEASE),
+                    attempts=F('attempts') + 1)
+        except IntegrityError:
+            free.pop(0)
+            continue
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        JOB_RETRY_DELAY * 2 ** (attempts - 1), JOB_MAX_RETRY_DELAY))
+
+
+def run_job(job_id):
+    """Выполняет забранную задачу: удаляет её при успехе, иначе планирует
+    повтор или отмечает неудачу."""
+    job = Job.objects.get(pk=job_id)
+    payload = json.loads(job.payload)
+    try:
+        TASKS[job.name](*payload['args'], **payload['kwargs'])
+    except Exception:
+        logger.exception('Задача %s упала', job.name)
+        job.last_error = traceback.format_exc()
+        job.slot = job.lease_until = None
+        if job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+        else:
+            job.status = Job.STATUS_QUEUED
+            job.run_after = timezone.now() + retry_delay(job.attempts)
+        job.save(update_fields=[
+            'status', 'slot', 'lease_until', 'run_after', 'last_error'])
+    else:
+        job.delete()
+
+
+def run_pending(queues=None):
+    """Выполняет все готовые задачи в текущем потоке; удобно в тестах."""
+    done = 0
+    for queue in queues or queue_limits():
+        release_expired(queue)
+        while True:
+            job = claim(queue)
+            if job is None:
+                break
+            run_job(job.pk)
+            done += 1
+    return done
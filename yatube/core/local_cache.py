@@ -0,0 +1,76 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from . import metrics
+
+METRICS_SECTION = 'local_cache'
+LOCAL_CACHE_TTL = 5
+
+
+class LocalCache:
+    """Ограниченный LRU-кеш в памяти процесса с коротким временем жизни.
+
+    Номер версии лежит в кеше default: invalidate() увеличивает его, и
+    экземпляр, заметив новую версию при следующем чтении, очищает свои
+    записи. С LocMemCache этот кеш у каждого процесса свой, поэтому сброс
+    согласован только внутри процесса, а другие обработчики видят
+    изменения не позже чем через ttl секунд. Попадания и промахи
+    попадают в раздел local_cache метрик.
+    """
+
+    def __init__(self, name, maxsize=1024, ttl=LOCAL_CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_key = f'local_cache:{name}:version'
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+
+    def _shared_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, time.time_ns(), None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self, key, load):
+        """Значение по ключу; при промахе — результат load().
+
+        Исключения load() не кешируются. Наружу отдаётся копия, чтобы
+        запросы не делили один объект модели.
+        """
+        version = self._shared_version()
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            metrics.observe(METRICS_SECTION, f'{self.name}.hits')
+            return copy.copy(entry[1])
+        metrics.observe(METRICS_SECTION, f'{self.name}.misses')
+        value = load()
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return copy.copy(value)
+
+    def invalidate(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            pass
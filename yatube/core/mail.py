@@ -0,0 +1,116 @@
+import pickle
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .jobs import task
+from .models import OutboxMessage
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_MAX_RETRY_DELAY = 6 * 60 * 60
+# Столько письмо считается занятым обработчиком; упавший обработчик
+# отпускает свои письма по истечении аренды.
+OUTBOX_LEASE = 10 * 60
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Не отправляет письма, а кладёт их в OutboxMessage.
+
+    Доставку выполняет send_outbox через OUTBOX_EMAIL_BACKEND, поэтому
+    медленный почтовый сервер не задерживает запрос.
+    """
+
+    def send_messages(self, email_messages):
+        now = timezone.now()
+        rows = []
+        for message in email_messages:
+            connection, message.connection = message.connection, None
+            try:
+                payload = pickle.dumps(message)
+            finally:
+                message.connection = connection
+            rows.append(OutboxMessage(
+                subject=str(message.subject)[:255],
+                recipients=', '.join(message.recipients()),
+                payload=payload,
+                next_attempt=now,
+            ))
+        OutboxMessage.objects.bulk_create(rows)
+        if rows:
+            deliver_outbox.delay()
+        return len(rows)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim(batch_size=OUTBOX_BATCH_SIZE):
+    """Берёт в аренду пачку писем, которым пора уходить.
+
+    UPDATE с условием на срок меняет только ещё не занятые строки, поэтому
+    два обработчика не получат одно письмо.
+    """
+    now = timezone.now()
+    due = OutboxMessage.objects.filter(
+        status=OutboxMessage.STATUS_PENDING, next_attempt__lte=now)
+    ids = list(due.order_by('next_attempt', 'pk').values_list(
+        'pk', flat=True)[:batch_size])
+    lease = uuid.uuid4().hex
+    due.filter(pk__in=ids).update(
+        lease=lease, next_attempt=now + timedelta(seconds=OUTBOX_LEASE))
+    return list(OutboxMessage.objects.filter(lease=lease).order_by('pk'))
+
+
+def deliver(batch_size=OUTBOX_BATCH_SIZE):
+    """Отправляет одну пачку через одно соединение с почтовым сервером.
+
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    rows = claim(batch_size)
+    if not rows:
+        return 0, 0
+    sent = failed = 0
+    with get_connection(settings.OUTBOX_EMAIL_BACKEND) as connection:
+        for row in rows:
+            reconnect = False
+            try:
+                message = pickle.loads(row.payload)
+                message.connection = connection
+                message.send()
+            except Exception as error:
+                reconnect = True
+                failed += 1
+                row.attempts += 1
+                row.last_error = f'{type(error).__name__}: {error}'
+                if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    row.status = OutboxMessage.STATUS_FAILED
+                row.next_attempt = timezone.now() + retry_delay(row.attempts)
+            else:
+                sent += 1
+                row.attempts += 1
+                row.status = OutboxMessage.STATUS_SENT
+                row.sent = timezone.now()
+            row.lease = ''
+            row.save(update_fields=[
+                'status', 'attempts', 'next_attempt', 'lease', 'last_error',
+                'sent'])
+            if reconnect:
+                # Соединение могло оборваться. Без open() бэкенд SMTP
+                # открывал бы новое соединение на каждое следующее письмо.
+                connection.close()
+                connection.open()
+    return sent, failed
+
+
+@task(queue='mail')
+def deliver_outbox():
+    while any(deliver()):
+        pass
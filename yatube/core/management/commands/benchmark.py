@@ -0,0 +1,101 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import metrics, template_profiling
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+def default_urls():
+    urls = [
+        reverse('posts:index'),
+        reverse('posts:trending'),
+        reverse('posts:group_index'),
+        reverse('posts:archive'),
+        reverse('about:author'),
+    ]
+    group = Group.objects.order_by('pk').first()
+    if group is not None:
+        urls.append(reverse('posts:group_list', args=(group.slug,)))
+    post = Post.objects.select_related('author').order_by('-pk').first()
+    if post is not None:
+        urls.append(reverse('posts:profile', args=(post.author.username,)))
+        urls.append(reverse('posts:post_detail', args=(post.pk,)))
+    return urls
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время ответа и число SQL-запросов страниц: первый '
+        '(холодный) запрос и повторные (тёплые).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--user', help='Имя пользователя, от которого идут запросы.')
+        parser.add_argument(
+            '--templates', action='store_true',
+            help='Показать время отрисовки по шаблонам и тегам.')
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть не меньше 1')
+        # Адрес не из INTERNAL_IPS, чтобы не включать debug_toolbar.
+        client = Client(REMOTE_ADDR='192.0.2.1')
+        if options['user']:
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f'Нет пользователя {options["user"]}')
+        self.stdout.write(
+            f'{"url":<40} {"код":>4} {"SQL хол.":>8} {"SQL тёпл.":>9} '
+            f'{"мс ср.":>8} {"мс p95":>8}')
+        if options['templates']:
+            template_profiling.enable()
+            metrics.reset(template_profiling.TEMPLATES)
+            metrics.reset(template_profiling.TAGS)
+        for url in options['urls'] or default_urls():
+            self.report(client, url, options['repeat'])
+        if options['templates']:
+            stats = metrics.snapshot()
+            for section in (template_profiling.TEMPLATES,
+                            template_profiling.TAGS):
+                self.report_section(
+                    section, stats.get(section, {}), options['top'])
+
+    def report(self, client, url, repeat):
+        with CaptureQueriesContext(connection) as cold:
+            response = client.get(url)
+        timings = []
+        warm_queries = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as warm:
+                started = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            warm_queries = max(warm_queries, len(warm))
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f'{url:<40} {response.status_code:>4} {len(cold):>8} '
+            f'{warm_queries:>9} {statistics.mean(timings):>8.1f} {p95:>8.1f}')
+
+    def report_section(self, section, stats, top):
+        self.stdout.write(
+            f'\n{section:<40} {"вызовов":>9} {"мс всего":>10} {"мс ср.":>8}')
+        ranked = sorted(stats.items(), key=lambda item: -item[1]['total_ms'])
+        for name, value in ranked[:top]:
+            self.stdout.write(
+                f'{name:<40} {value["count"]:>9} {value["total_ms"]:>10.1f} '
+                f'{value["total_ms"] / value["count"]:>8.2f}')
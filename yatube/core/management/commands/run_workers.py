@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from core import jobs
+
+
+def run_in_worker(job_id):
+    try:
+        jobs.run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из таблицы Job пулом потоков или '
+        'процессов с учётом лимитов параллельности очередей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', dest='queues',
+            help='Очередь для обработки; по умолчанию все из JOB_QUEUES.')
+        parser.add_argument(
+            '--pool', choices=('thread', 'process'), default='thread')
+        parser.add_argument(
+            '--workers', type=int,
+            help='Размер пула; по умолчанию сумма лимитов очередей.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и завершиться.')
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Пауза в секундах, когда задач нет.')
+
+    def make_executor(self, pool, workers):
+        if pool == 'process':
+            # Дочерние процессы не должны унаследовать открытые соединения.
+            connections.close_all()
+            return ProcessPoolExecutor(
+                workers, initializer=connections.close_all)
+        return ThreadPoolExecutor(workers)
+
+    def submit_ready(self, executor, queues, running):
+        for queue in queues:
+            jobs.release_expired(queue)
+            job = jobs.claim(queue)
+            while job is not None:
+                running.add(executor.submit(run_in_worker, job.pk))
+                job = jobs.claim(queue)
+
+    def collect(self, finished):
+        for future in finished:
+            try:
+                future.result()
+            except Exception as error:
+                self.stderr.write(f'Сбой обработчика: {error}')
+        return len(finished)
+
+    def handle(self, *args, **options):
+        limits = jobs.queue_limits()
+        queues = options['queues'] or list(limits)
+        unknown = set(queues) - set(limits)
+        if unknown:
+            raise CommandError(f'Нет таких очередей: {", ".join(unknown)}')
+        workers = options['workers'] or sum(limits[q] for q in queues)
+        done = 0
+        running = set()
+        with self.make_executor(options['pool'], workers) as executor:
+            while True:
+                self.submit_ready(executor, queues, running)
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                finished, running = wait(
+                    running, timeout=options['interval'],
+                    return_when=FIRST_COMPLETED)
+                done += self.collect(finished)
+        self.stdout.write(f'Выполнено задач: {done}')
@@ -0,0 +1,29 @@
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_values = defaultdict(lambda: [0, 0.0])
+
+
+def observe(section, name, duration_ms=0.0, count=1):
+    """Добавляет вызовы и их время к счётчику name раздела section."""
+    with _lock:
+        value = _values[section, name]
+        value[0] += count
+        value[1] += duration_ms
+
+
+def snapshot():
+    """Счётчики процесса: {раздел: {имя: {'count', 'total_ms'}}}."""
+    result = defaultdict(dict)
+    with _lock:
+        for (section, name), (count, total_ms) in _values.items():
+            result[section][name] = {
+                'count': count, 'total_ms': round(total_ms, 3)}
+    return dict(result)
+
+
+def reset(section=None):
+    with _lock:
+        for key in [key for key in _values if section in (None, key[0])]:
+            del _values[key]
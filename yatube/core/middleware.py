@@ -0,0 +1,41 @@
+from django.db import connection
+from django.urls import reverse
+
+from .profiling import profile_request, requested_mode
+from .querylog import QueryTimer
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос сотрудника по заголовку X-Profile или ?_profile=.
+
+    Значение cprofile сохраняет .prof для pstats и snakeviz, sample —
+    свёрнутые стеки для flamegraph. Ссылка на результат приходит в
+    заголовке X-Profile-Result. Без флага запрос идёт как обычно.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        response, name = profile_request(request, mode, self.get_response)
+        response['X-Profile-Result'] = request.build_absolute_uri(
+            reverse('profiling_result', args=(name,)))
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """Пишет в журнал запросы к базе дольше SLOW_QUERY_THRESHOLD_MS.
+
+    Для каждой новой формы SQL один раз снимается план выполнения,
+    повторы складываются в буфер, который видно в admin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with connection.execute_wrapper(QueryTimer(request)):
+            return self.get_response(request)
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='тема')),
+                ('recipients', models.TextField(verbose_name='получатели')),
+                ('payload', models.BinaryField(verbose_name='сериализованное письмо')),
+                ('status', models.CharField(choices=[('pending', 'ждёт отправки'), ('sent', 'отправлено'), ('failed', 'не отправлено')], default='pending', max_length=10, verbose_name='статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='попыток отправки')),
+                ('next_attempt', models.DateTimeField(help_text='Пока письмо отправляется, здесь конец его аренды', verbose_name='следующая попытка')),
+                ('lease', models.CharField(blank=True, max_length=32, verbose_name='метка обработчика')),
+                ('last_error', models.TextField(blank=True, verbose_name='последняя ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='дата постановки в очередь')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='дата отправки')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(fields=['status', 'next_attempt'], name='core_outbox_status_246584_idx'),
+        ),
+    ]
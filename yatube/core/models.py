@@ -0,0 +1,86 @@
+from django.db import models
+
+
+class OutboxMessage(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'ждёт отправки'),
+        (STATUS_SENT, 'отправлено'),
+        (STATUS_FAILED, 'не отправлено'),
+    )
+
+    subject = models.CharField(max_length=255, verbose_name='тема')
+    recipients = models.TextField(verbose_name='получатели')
+    payload = models.BinaryField(verbose_name='сериализованное письмо')
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING,
+        verbose_name='статус')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='попыток отправки')
+    next_attempt = models.DateTimeField(
+        verbose_name='следующая попытка',
+        help_text='Пока письмо отправляется, здесь конец его аренды')
+    lease = models.CharField(
+        max_length=32, blank=True, verbose_name='метка обработчика')
+    last_error = models.TextField(blank=True, verbose_name='последняя ошибка')
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата постановки в очередь')
+    sent = models.DateTimeField(
+        null=True, blank=True, verbose_name='дата отправки')
+
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'next_attempt'])]
+
+    def __str__(self):
+        return self.subject
+
+
+class Job(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, 'в очереди'),
+        (STATUS_RUNNING, 'выполняется'),
+        (STATUS_FAILED, 'не выполнено'),
+    )
+
+    queue = models.CharField(max_length=50, verbose_name='очередь')
+    name = models.CharField(max_length=200, verbose_name='задача')
+    payload = models.TextField(
+        default='{}', verbose_name='аргументы',
+        help_text='Позиционные и именованные аргументы задачи в JSON')
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED,
+        verbose_name='статус')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='попыток')
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5, verbose_name='максимум попыток')
+    run_after = models.DateTimeField(verbose_name='не раньше')
+    slot = models.PositiveSmallIntegerField(
+        null=True, blank=True, verbose_name='слот очереди',
+        help_text='Номер занятого места из лимита параллельности очереди')
+    lease_until = models.DateTimeField(
+        null=True, blank=True, verbose_name='аренда до')
+    last_error = models.TextField(blank=True, verbose_name='последняя ошибка')
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата постановки')
+
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['queue', 'status', 'run_after'])]
+        constraints = [
+            # Выполняющаяся задача держит слот; уникальность слота и есть
+            # лимит параллельности очереди для всех обработчиков сразу.
+            models.UniqueConstraint(
+                fields=['queue', 'slot'],
+                condition=models.Q(status='running'),
+                name='unique_running_slot')
+        ]
+
+    def __str__(self):
+        return f'{self.queue}: {self.name}'
@@ -0,0 +1,59 @@
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.cache import (get_cache_key, get_max_age, has_vary_header,
+                                learn_cache_key, patch_response_headers)
+
+DEFAULT_GRACE = 60
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def _cacheable(request, response):
+    if response.streaming or response.status_code != 200:
+        return False
+    if (not request.COOKIES and response.cookies
+            and has_vary_header(response, 'Cookie')):
+        return False
+    return ('private' not in response.get('Cache-Control', ())
+            and get_max_age(response) != 0)
+
+
+def stale_cache_page(timeout, grace=DEFAULT_GRACE, key_prefix=''):
+    """cache_page, который не даёт всем запросам разом пересчитать страницу.
+
+    Запись живёт timeout + grace секунд. Когда она устарела, страницу
+    пересчитывает один запрос — тот, кто первым взял блокировку через
+    cache.add; остальные до конца grace получают прежнюю версию. Ключи
+    и заголовки Vary те же, что у cache_page.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = get_cache_key(request, key_prefix, 'GET', cache)
+            entry = cache.get(key) if key is not None else None
+            lock = None
+            if entry is not None:
+                fresh_until, response = entry
+                if time.time() < fresh_until:
+                    return response
+                lock = f'{key}:refresh'
+                if not cache.add(lock, 1, REFRESH_LOCK_TIMEOUT):
+                    return response
+            try:
+                response = view(request, *args, **kwargs)
+                if request.method == 'GET' and _cacheable(request, response):
+                    patch_response_headers(response, timeout)
+                    key = learn_cache_key(
+                        request, response, timeout + grace, key_prefix, cache)
+                    cache.set(
+                        key, (time.time() + timeout, response),
+                        timeout + grace)
+                return response
+            finally:
+                if lock is not None:
+                    cache.delete(lock)
+        return wrapper
+    return decorator
@@ -0,0 +1,90 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils.text import slugify
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+PROFILE_MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Раз в interval секунд снимает стек потока запроса из другого потока.
+
+    Результат — свёрнутые стеки в формате flamegraph.pl и speedscope:
+    кадры через ';', затем число попаданий.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def runcall(self, func, *args):
+        self._thread.start()
+        try:
+            return func(*args)
+        finally:
+            self._stopped.set()
+            self._thread.join()
+
+    def dump_stats(self, path):
+        with open(path, 'w') as out:
+            for stack, count in self.counts.most_common():
+                out.write(f'{stack} {count}\n')
+
+
+def requested_mode(request):
+    """Режим профилирования из заголовка X-Profile или ?_profile=.
+
+    Вызывается на каждый запрос, поэтому сначала только дешёвые проверки
+    без разбора строки запроса.
+    """
+    mode = request.META.get(PROFILE_HEADER)
+    if mode is None and PROFILE_PARAM in request.META.get('QUERY_STRING', ''):
+        mode = request.GET.get(PROFILE_PARAM)
+    if mode not in PROFILE_MODES:
+        return None
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_staff:
+        return None
+    return mode
+
+
+def result_name(request, mode):
+    extension = 'prof' if mode == 'cprofile' else 'collapsed'
+    path = slugify(request.path.replace('/', '-')) or 'root'
+    return (f'{time.strftime("%Y%m%d-%H%M%S")}-{path[:50]}-'
+            f'{uuid.uuid4().hex[:8]}.{extension}')
+
+
+def profile_request(request, mode, get_response):
+    """Выполняет запрос под профилировщиком и сохраняет результат в
+    PROFILING_ROOT; возвращает ответ и имя файла."""
+    profiler = cProfile.Profile() if mode == 'cprofile' else StackSampler()
+    response = profiler.runcall(get_response, request)
+    os.makedirs(settings.PROFILING_ROOT, exist_ok=True)
+    name = result_name(request, mode)
+    profiler.dump_stats(os.path.join(settings.PROFILING_ROOT, name))
+    return response, name
@@ -0,0 +1,103 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger('yatube.slow_queries')
+
+# Списки IN (%s, %s, ...) и строки VALUES разной длины — одна форма.
+IN_LIST = re.compile(r'IN \((?:%s, )+%s\)')
+VALUES_ROWS = re.compile(r'(\((?:%s, )*%s\))(?:, \1)+')
+
+_lock = threading.Lock()
+_shapes = OrderedDict()
+_state = threading.local()
+
+
+def sql_shape(sql):
+    return IN_LIST.sub('IN (%s, ...)', VALUES_ROWS.sub(r'\1, ...', sql))
+
+
+def explain(connection, sql, params):
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN ')
+    _state.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return '\n'.join(
+                ' '.join(str(column) for column in row)
+                for row in cursor.fetchall())
+    except DatabaseError as error:
+        return f'не удалось получить план: {error}'
+    finally:
+        _state.explaining = False
+
+
+def record(sql, params, duration_ms, view_name, connection):
+    """Запоминает медленный запрос; план строится один раз на форму."""
+    shape = sql_shape(sql)
+    with _lock:
+        entry = _shapes.pop(shape, None)
+        if entry is not None:
+            _shapes[shape] = entry
+    if entry is None:
+        entry = {
+            'shape': shape, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'plan': explain(connection, sql, params),
+        }
+        with _lock:
+            _shapes[shape] = _shapes.get(shape, entry)
+            entry = _shapes[shape]
+            while len(_shapes) > settings.SLOW_QUERY_BUFFER_SIZE:
+                _shapes.popitem(last=False)
+    with _lock:
+        entry['count'] += 1
+        entry['total_ms'] += duration_ms
+        entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        entry['view'] = view_name
+        entry['params'] = repr(params)[:500]
+        entry['last_seen'] = time.time()
+    logger.warning(
+        'Медленный запрос %.1f мс в %s: %s; параметры %r',
+        duration_ms, view_name, sql, params)
+
+
+def slow_queries():
+    """Снимок буфера: самые затратные формы запросов первыми."""
+    with _lock:
+        entries = [dict(entry) for entry in _shapes.values()]
+    return sorted(entries, key=lambda entry: -entry['total_ms'])
+
+
+def clear():
+    with _lock:
+        _shapes.clear()
+
+
+class QueryTimer:
+    """execute_wrapper, который замеряет запросы одного HTTP-запроса."""
+
+    def __init__(self, request):
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_state, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+                match = getattr(self.request, 'resolver_match', None)
+                record(
+                    sql, None if many else params, duration_ms,
+                    match.view_name if match else self.request.path,
+                    context['connection'])
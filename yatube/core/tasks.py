@@ -0,0 +1 @@
+from .mail import deliver_outbox  # noqa: F401
@@ -0,0 +1,58 @@
+import time
+
+from django.template.base import Node, Template, TokenType
+
+from . import metrics
+
+TEMPLATES = 'templates'
+TAGS = 'template_tags'
+
+_originals = {}
+
+
+def _profiled_render(self, context):
+    started = time.perf_counter()
+    try:
+        return _originals['render'](self, context)
+    finally:
+        metrics.observe(
+            TEMPLATES, self.origin.template_name or self.name or '<string>',
+            (time.perf_counter() - started) * 1000)
+
+
+def _profiled_render_annotated(self, context):
+    token = getattr(self, 'token', None)
+    if token is None or token.token_type != TokenType.BLOCK:
+        return _originals['render_annotated'](self, context)
+    started = time.perf_counter()
+    try:
+        return _originals['render_annotated'](self, context)
+    finally:
+        metrics.observe(
+            TAGS, token.contents.split(None, 1)[0],
+            (time.perf_counter() - started) * 1000)
+
+
+def enable():
+    """Включает учёт времени и вызовов по шаблонам и тегам.
+
+    Время копится с учётом вложенных шаблонов и тегов: base.html
+    включает всё, что отрисовано внутри него, {% for %} — своё тело.
+    """
+    if _originals:
+        return
+    _originals['render'] = Template._render
+    _originals['render_annotated'] = Node.render_annotated
+    Template._render = _profiled_render
+    Node.render_annotated = _profiled_render_annotated
+
+
+def disable():
+    if not _originals:
+        return
+    Template._render = _originals.pop('render')
+    Node.render_annotated = _originals.pop('render_annotated')
+
+
+def is_enabled():
+    return bool(_originals)
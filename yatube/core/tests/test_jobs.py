@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+from posts.models import Follow, Notification, Post
+
+User = get_user_model()
+
+calls = []
+
+
+@jobs.task()
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+
+
+@jobs.task(max_attempts=2)
+def explode():
+    raise RuntimeError('сломалось')
+
+
+class JobTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_enqueues_and_runs(self):
+        """delay ставит задачу в базу, обработчик выполняет и удаляет её."""
+        record.delay(1, suffix='!')
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'core.tests.test_jobs.record')
+        self.assertEqual(calls, [])
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(calls, ['1!'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_retried_with_backoff(self):
+        """Упавшая задача откладывается, а после лимита попыток бросается."""
+        explode.delay()
+        jobs.run_pending()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('сломалось', job.last_error)
+        Job.objects.update(run_after=timezone.now())
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    @override_settings(JOB_QUEUES={'default': 1})
+    def test_queue_concurrency_limit(self):
+        """Очередь не отдаёт задач больше, чем у неё слотов."""
+        record.delay(1)
+        record.delay(2)
+        first = jobs.claim('default')
+        self.assertIsNotNone(first)
+        self.assertIsNone(jobs.claim('default'))
+        jobs.run_job(first.pk)
+        self.assertIsNotNone(jobs.claim('default'))
+
+    @override_settings(JOB_QUEUES={'default': 1})
+    def test_expired_lease_released(self):
+        """Задача упавшего обработчика возвращается в очередь."""
+        record.delay(1)
+        jobs.claim('default')
+        Job.objects.update(lease_until=timezone.now() - timedelta(seconds=1))
+        jobs.release_expired('default')
+        self.assertIsNotNone(jobs.claim('default'))
+
+    def test_background_work_goes_through_jobs(self):
+        """Уведомления и письма выполняются задачами, а не в запросе."""
+        author = User.objects.create_user(username='author')
+        reader = User.objects.create_user(
+            username='reader', email='reader@example.com', password='pass')
+        Follow.objects.create(user=reader, author=author)
+        Post.objects.create(text='Пост', author=author)
+        with self.settings(
+                EMAIL_BACKEND='core.mail.OutboxEmailBackend',
+                OUTBOX_EMAIL_BACKEND=(
+                    'django.core.mail.backends.locmem.EmailBackend')):
+            self.client.post(
+                reverse('users:password_reset_form'),
+                {'email': 'reader@example.com'})
+            self.assertFalse(Notification.objects.exists())
+            self.assertEqual(len(mail.outbox), 0)
+            jobs.run_pending()
+        self.assertTrue(
+            Notification.objects.filter(recipient=reader).exists())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class RunWorkersTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_thread_pool_drains_queue(self):
+        for value in range(5):
+            record.delay(value)
+        out = StringIO()
+        call_command('run_workers', '--once', '--queue=default', stdout=out)
+        self.assertIn('Выполнено задач: 5', out.getvalue())
+        self.assertEqual(sorted(calls), [str(value) for value in range(5)])
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core import metrics
+from core.local_cache import METRICS_SECTION, LocalCache
+
+
+class LocalCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset(METRICS_SECTION)
+        self.loads = []
+
+    def load(self, value):
+        def loader():
+            self.loads.append(value)
+            return value
+        return loader
+
+    def test_hits_and_misses_counted(self):
+        local = LocalCache('test', maxsize=10)
+        local.get('a', self.load(1))
+        local.get('a', self.load(1))
+        stats = metrics.snapshot()[METRICS_SECTION]
+        self.assertEqual(stats['test.hits']['count'], 1)
+        self.assertEqual(stats['test.misses']['count'], 1)
+        self.assertEqual(self.loads, [1])
+
+    def test_least_recently_used_evicted(self):
+        local = LocalCache('test', maxsize=2)
+        local.get('a', self.load('a'))
+        local.get('b', self.load('b'))
+        local.get('a', self.load('a'))
+        local.get('c', self.load('c'))
+        local.get('a', self.load('a'))
+        local.get('b', self.load('b'))
+        self.assertEqual(self.loads, ['a', 'b', 'c', 'b'])
+
+    def test_entries_expire(self):
+        local = LocalCache('test', ttl=5)
+        with mock.patch('core.local_cache.time.monotonic', return_value=0):
+            local.get('a', self.load(1))
+        with mock.patch('core.local_cache.time.monotonic', return_value=6):
+            local.get('a', self.load(2))
+        self.assertEqual(self.loads, [1, 2])
+
+    def test_invalidate_reaches_other_processes(self):
+        """Новая версия в общем кеше сбрасывает записи всех экземпляров."""
+        first = LocalCache('shared')
+        second = LocalCache('shared')
+        first.get('a', self.load(1))
+        second.get('a', self.load(1))
+        first.invalidate()
+        self.assertEqual(second.get('a', self.load(2)), 2)
+        self.assertEqual(first.get('a', self.load(2)), 2)
+
+    def test_errors_not_cached(self):
+        local = LocalCache('test')
+        with self.assertRaises(LookupError):
+            local.get('a', mock.Mock(side_effect=LookupError))
+        self.assertEqual(local.get('a', self.load(1)), 1)
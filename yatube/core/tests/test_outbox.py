@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import mail as outbox
+from core.models import OutboxMessage
+
+User = get_user_model()
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('почтовый сервер недоступен')
+
+
+class FlakyBackend(BaseEmailBackend):
+    """Как бэкенд SMTP: без открытого соединения открывает своё на вызов.
+
+    Письма с темой «сбой» не уходят.
+    """
+
+    opened = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.connected = False
+
+    def open(self):
+        if self.connected:
+            return False
+        FlakyBackend.opened += 1
+        self.connected = True
+        return True
+
+    def close(self):
+        self.connected = False
+
+    def send_messages(self, email_messages):
+        created = self.open()
+        try:
+            if any(message.subject == 'сбой' for message in email_messages):
+                raise ConnectionError('соединение оборвалось')
+            return len(email_messages)
+        finally:
+            if created:
+                self.close()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='reader', email='reader@example.com', password='pass')
+
+    def request_reset(self):
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'reader@example.com'})
+
+    def test_request_only_enqueues(self):
+        """Сброс пароля кладёт письмо в очередь, не отправляя его."""
+        self.request_reset()
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboxMessage.objects.get()
+        self.assertEqual(queued.recipients, 'reader@example.com')
+        self.assertEqual(queued.status, OutboxMessage.STATUS_PENDING)
+
+    def test_worker_delivers(self):
+        """Команда отправляет письма из очереди и отмечает их."""
+        self.request_reset()
+        out = StringIO()
+        call_command('send_outbox', stdout=out)
+        self.assertIn('Отправлено писем: 1, ошибок: 0', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        queued = OutboxMessage.objects.get()
+        self.assertEqual(queued.status, OutboxMessage.STATUS_SENT)
+        self.assertEqual(outbox.deliver(), (0, 0))
+
+    @override_settings(
+        OUTBOX_EMAIL_BACKEND='core.tests.test_outbox.FailingBackend')
+    def test_failures_back_off(self):
+        """Неудачная отправка откладывается всё дольше, затем бросается."""
+        self.request_reset()
+        self.assertEqual(outbox.deliver(), (0, 1))
+        queued = OutboxMessage.objects.get()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn('почтовый сервер недоступен', queued.last_error)
+        self.assertGreater(queued.next_attempt, timezone.now())
+        self.assertEqual(outbox.deliver(), (0, 0))
+        for _ in range(outbox.OUTBOX_MAX_ATTEMPTS - 1):
+            OutboxMessage.objects.update(next_attempt=timezone.now())
+            outbox.deliver()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboxMessage.STATUS_FAILED)
+
+    @override_settings(
+        OUTBOX_EMAIL_BACKEND='core.tests.test_outbox.FlakyBackend')
+    def test_connection_reopened_once_after_failure(self):
+        """После сбоя пачка продолжает идти через одно новое соединение."""
+        for subject in ('сбой', 'первое', 'второе'):
+            mail.send_mail(subject, 'текст', None, ['reader@example.com'])
+        FlakyBackend.opened = 0
+        self.assertEqual(outbox.deliver(), (2, 1))
+        self.assertEqual(FlakyBackend.opened, 2)
+
+    def test_claim_is_exclusive(self):
+        """Занятое письмо не достаётся второму обработчику."""
+        self.request_reset()
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(outbox.claim(), [])
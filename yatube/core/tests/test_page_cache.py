@@ -0,0 +1,80 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core.page_cache import stale_cache_page
+
+THREADS = 8
+
+
+class StaleCachePageTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        cache.clear()
+
+    def make_view(self, delay=0):
+        @stale_cache_page(10, grace=60, key_prefix='test_page')
+        def view(request):
+            with self.calls_lock:
+                self.calls += 1
+                version = self.calls
+            time.sleep(delay)
+            return HttpResponse(f'версия {version}')
+        return view
+
+    def get(self, view):
+        return view(self.factory.get('/page/')).content.decode()
+
+    def later(self, seconds):
+        clock = mock.Mock()
+        clock.time.return_value = time.time() + seconds
+        return mock.patch('core.page_cache.time', clock)
+
+    def test_fresh_entry_served_from_cache(self):
+        view = self.make_view()
+        self.assertEqual(self.get(view), 'версия 1')
+        self.assertEqual(self.get(view), 'версия 1')
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_entry_recomputed_once(self):
+        """После устаревания страницу пересчитывает ровно один запрос,
+        остальные в это время получают прежнюю версию."""
+        view = self.make_view(delay=0.2)
+        self.get(view)
+        barrier = threading.Barrier(THREADS)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(self.get(view))
+
+        with self.later(20):
+            threads = [
+                threading.Thread(target=worker) for _ in range(THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(self.get(view), 'версия 2')
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(results.count('версия 2'), 1)
+        self.assertEqual(results.count('версия 1'), THREADS - 1)
+
+    def test_failed_refresh_releases_lock(self):
+        view = self.make_view()
+        self.get(view)
+        with self.later(20):
+            with mock.patch.object(
+                    HttpResponse, '__init__', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    self.get(view)
+            self.assertEqual(self.get(view), 'версия 3')
@@ -0,0 +1,97 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.profiling import StackSampler
+
+User = get_user_model()
+
+TEMP_PROFILING_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+ABOUT_URL = reverse('about:author')
+
+
+def result_path(response):
+    return os.path.join(
+        TEMP_PROFILING_ROOT, response['X-Profile-Result'].rsplit('/', 1)[1])
+
+
+@override_settings(PROFILING_ROOT=TEMP_PROFILING_ROOT)
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='user')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PROFILING_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_cprofile_by_header(self):
+        """Сотрудник с заголовком получает ссылку на .prof."""
+        response = self.staff_client.get(
+            ABOUT_URL, HTTP_X_PROFILE='cprofile')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['X-Profile-Result'].endswith('.prof'))
+        stats = pstats.Stats(result_path(response))
+        self.assertTrue(stats.total_calls)
+        result = self.staff_client.get(response['X-Profile-Result'])
+        self.assertEqual(result.status_code, 200)
+
+    def test_sampler_by_query_flag(self):
+        response = self.staff_client.get(ABOUT_URL, {'_profile': 'sample'})
+        self.assertTrue(response['X-Profile-Result'].endswith('.collapsed'))
+        self.assertTrue(os.path.exists(result_path(response)))
+
+    def test_not_triggered_for_others(self):
+        """Без флага или не сотруднику профилирование не включается."""
+        user_client = Client()
+        user_client.force_login(self.user)
+        responses = [
+            self.staff_client.get(ABOUT_URL),
+            user_client.get(ABOUT_URL, HTTP_X_PROFILE='cprofile'),
+            Client().get(ABOUT_URL, {'_profile': 'sample'}),
+        ]
+        for response in responses:
+            self.assertFalse(response.has_header('X-Profile-Result'))
+
+    def test_results_only_for_staff(self):
+        response = self.staff_client.get(
+            ABOUT_URL, HTTP_X_PROFILE='cprofile')
+        user_client = Client()
+        user_client.force_login(self.user)
+        result = user_client.get(response['X-Profile-Result'])
+        self.assertEqual(result.status_code, 302)
+
+
+class StackSamplerTests(TestCase):
+    def test_collapsed_stacks(self):
+        """Сэмплер пишет свёрнутые стеки для flamegraph."""
+        def busy():
+            deadline = time.monotonic() + 0.05
+            while time.monotonic() < deadline:
+                pass
+
+        sampler = StackSampler(interval=0.001)
+        sampler.runcall(busy)
+        path = os.path.join(tempfile.mkdtemp(), 'out.collapsed')
+        sampler.dump_stats(path)
+        with open(path) as result:
+            lines = result.read().splitlines()
+        shutil.rmtree(os.path.dirname(path))
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertIn('test_profiling.py:busy', stack)
+        self.assertGreater(int(count), 0)
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import querylog
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.post = Post.objects.create(text='Пост', author=cls.staff)
+
+    def setUp(self):
+        cache.clear()
+        querylog.clear()
+        self.addCleanup(querylog.clear)
+
+    def test_shape_collapses_lists(self):
+        """Списки IN и строки VALUES разной длины дают одну форму."""
+        self.assertEqual(
+            querylog.sql_shape('SELECT 1 WHERE id IN (%s, %s, %s)'),
+            querylog.sql_shape('SELECT 1 WHERE id IN (%s, %s)'))
+        self.assertEqual(
+            querylog.sql_shape('INSERT INTO t VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO t VALUES (%s, %s), ...')
+
+    def test_queries_recorded_with_view_and_plan(self):
+        """Запрос попадает в буфер с именем view и планом выполнения."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        with self.assertLogs('yatube.slow_queries', 'WARNING'):
+            self.client.get(url)
+            self.client.get(url)
+        entries = [
+            entry for entry in querylog.slow_queries()
+            if 'FROM "posts_post"' in entry['shape']
+            and entry['view'] == 'posts:post_detail']
+        self.assertTrue(entries)
+        self.assertTrue(all(entry['plan'] for entry in entries))
+        self.assertFalse([
+            entry for entry in querylog.slow_queries()
+            if entry['shape'].startswith('EXPLAIN')])
+
+    @override_settings(SLOW_QUERY_BUFFER_SIZE=2)
+    def test_buffer_is_bounded(self):
+        with self.assertLogs('yatube.slow_queries', 'WARNING'):
+            self.client.get(reverse('posts:index'))
+        self.assertLessEqual(len(querylog.slow_queries()), 2)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10 ** 6)
+    def test_fast_queries_skipped(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('posts:index'))
+        self.assertTrue(queries)
+        self.assertEqual(querylog.slow_queries(), [])
+
+    def test_admin_page_for_staff_only(self):
+        """Буфер виден в admin только сотрудникам."""
+        url = reverse('slow_queries')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        staff_client = Client()
+        staff_client.force_login(self.staff)
+        with self.assertLogs('yatube.slow_queries', 'WARNING'):
+            response = staff_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Медленные запросы')
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core import metrics, template_profiling
+from posts.models import Post
+
+User = get_user_model()
+
+
+class TemplateProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        Post.objects.create(text='Пост', author=cls.staff)
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        template_profiling.enable()
+        self.addCleanup(template_profiling.disable)
+
+    def test_templates_and_tags_counted(self):
+        """Учитываются шаблоны, включая родительский, и теги."""
+        self.client.get(reverse('posts:index'))
+        stats = metrics.snapshot()
+        templates = stats[template_profiling.TEMPLATES]
+        tags = stats[template_profiling.TAGS]
+        for name in ('base.html', 'posts/index.html', 'includes/header.html'):
+            with self.subTest(name=name):
+                self.assertGreaterEqual(templates[name]['count'], 1)
+        self.assertGreater(tags['url']['count'], 1)
+        self.assertGreaterEqual(
+            templates['base.html']['total_ms'], tags['url']['total_ms'])
+
+    def test_disable_stops_counting(self):
+        template_profiling.disable()
+        self.client.get(reverse('about:author'))
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_metrics_endpoint_for_staff(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        self.client.get(reverse('about:author'))
+        response = self.client.get(url)
+        self.assertIn('base.html', response.json()['templates'])
+
+    def test_benchmark_reports_templates(self):
+        out = StringIO()
+        call_command(
+            'benchmark', reverse('about:author'), '--repeat=1',
+            '--templates', stdout=out)
+        self.assertIn('template_tags', out.getvalue())
+        self.assertIn('base.html', out.getvalue())
@@ -1,8 +1,36 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.http import HttpResponseNotFound, JsonResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.views.static import serve
+
+from . import metrics, querylog
+from .context_processors.year import year
+
+NOT_FOUND_CACHE_KEY = 'page_not_found:anonymous'
+NOT_FOUND_PATH = 'NOT-FOUND-PATH'
+NOT_FOUND_TIMEOUT = 60 * 60
 
 
 def page_not_found(request, exception):
-    return render(request, 'core/404.html', {'path': request.path}, status=404)
+    """Гостям отдаёт один раз отрисованную страницу без контекст-процессоров.
+
+    Её видят в основном боты, перебирающие адреса, и она у всех одна:
+    меняется только адрес, который подставляется в готовый текст.
+    """
+    if request.user.is_authenticated:
+        return render(
+            request, 'core/404.html', {'path': request.path}, status=404)
+    body = cache.get(NOT_FOUND_CACHE_KEY)
+    if body is None:
+        body = render_to_string(
+            'core/404.html', {'path': NOT_FOUND_PATH, **year(request)})
+        cache.set(NOT_FOUND_CACHE_KEY, body, NOT_FOUND_TIMEOUT)
+    return HttpResponseNotFound(
+        body.replace(NOT_FOUND_PATH, escape(request.path)))
 
 
 def server_error(request):
@@ -15,3 +43,24 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+@staff_member_required
+def profiling_result(request, name):
+    return serve(request, name, settings.PROFILING_ROOT)
+
+
+@staff_member_required
+def slow_queries(request):
+    if request.method == 'POST':
+        querylog.clear()
+    return render(request, 'core/slow_queries.html', {
+        'title': 'Медленные запросы',
+        'entries': querylog.slow_queries(),
+        'threshold': settings.SLOW_QUERY_THRESHOLD_MS,
+    })
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse(metrics.snapshot())
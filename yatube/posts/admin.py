@@ -1,20 +1,125 @@
+from datetime import datetime
+
 from django.contrib import admin
+from django.contrib.admin.widgets import ForeignKeyRawIdWidget
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import ArchiveMonth, Post, Group, Comment, Follow
+
+ADMIN_COUNT_LIMIT = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор списков admin без COUNT(*) по всей таблице.
+
+    Без фильтров число строк оценивается по MAX(id) из первичного ключа,
+    с фильтрами считается не дальше ADMIN_COUNT_LIMIT строк.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            return queryset.aggregate(last=Max('pk'))['last'] or 0
+        return queryset.order_by()[:ADMIN_COUNT_LIMIT].count()
+
+
+class BareRawIdWidget(ForeignKeyRawIdWidget):
+    """Поле id без подписи: подпись стоит запроса на каждую строку."""
+
+    def label_and_url_for_value(self, value):
+        return '', ''
+
+
+class ArchiveMonthFilter(admin.SimpleListFilter):
+    """Фильтр по месяцу публикации вместо date_hierarchy.
+
+    Варианты берутся из сводки ArchiveMonth, а не из DISTINCT по датам
+    всей таблицы; выбранный месяц отбирается диапазоном по индексу даты.
+    """
+
+    title = 'месяц публикации'
+    parameter_name = 'month'
 
-from .models import Post, Group, Comment, Follow
+    def lookups(self, request, model_admin):
+        return [
+            (f'{row.year}-{row.month}', f'{row.month:02}.{row.year}')
+            for row in ArchiveMonth.objects.filter(
+                scope=ArchiveMonth.SCOPE_ALL, scope_id=0, post_count__gt=0)
+        ]
 
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            year, month = map(int, self.value().split('-'))
+            start = timezone.make_aware(datetime(year, month, 1))
+            end = timezone.make_aware(
+                datetime(year + month // 12, month % 12 + 1, 1))
+        except ValueError:
+            return queryset.none()
+        return queryset.filter(pub_date__gte=start, pub_date__lt=end)
 
-class PostAdmin(admin.ModelAdmin):
+
+class FastChangeListMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    author_lookup = 'author__username'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по индексам: число — по id, @имя — по автору."""
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        if term.startswith('@') and len(term) > 1:
+            return queryset.filter(**{self.author_lookup: term[1:]}), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class PostAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author', 'group')
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_filter = ('pub_date', ArchiveMonthFilter)
     empty_value_display = '-пусто-'
 
+    def get_changelist_form(self, request, **kwargs):
+        # Название группы и так видно в колонке, выбранной через JOIN.
+        kwargs.setdefault('widgets', {'group': BareRawIdWidget(
+            Post._meta.get_field('group').remote_field, self.admin_site)})
+        return super().get_changelist_form(request, **kwargs)
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
+
+class CommentAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ('pk', 'text', 'created', 'author', 'post')
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
+    search_fields = ('text',)
+    list_filter = ('created',)
+    empty_value_display = '-пусто-'
+
+
+class FollowAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ('pk', 'user', 'author')
+    list_select_related = ('user', 'author')
+    autocomplete_fields = ('user', 'author')
+
 
 admin.site.register(Post, PostAdmin)
 
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
 
-admin.site.register(Comment)
+admin.site.register(Comment, CommentAdmin)
 
-admin.site.register(Follow)
+admin.site.register(Follow, FollowAdmin)
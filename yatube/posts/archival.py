@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import notifications, signals
+from .models import (ArchivedComment, ArchivedPost, Comment, Notification,
+                     Post)
+
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+
+def archive_cutoff(days=ARCHIVE_AFTER_DAYS):
+    """Граница переноса, округлённая до начала месяца.
+
+    Так каждый месяц целиком лежит либо в Post, либо в архиве, и страница
+    архива за месяц читает только одну из таблиц.
+    """
+    moment = timezone.localtime(timezone.now() - timedelta(days=days))
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Переносит пачку самых старых постов с комментариями в архив.
+
+    id сохраняются: курсор ленты продолжает работать и в архиве.
+    Возвращает количество перенесённых постов.
+    """
+    with transaction.atomic():
+        posts = list(Post.objects.filter(
+            pub_date__lt=cutoff).order_by('pk')[:batch_size])
+        if not posts:
+            return 0
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(
+                pk=post.pk, text=post.text, pub_date=post.pub_date,
+                author_id=post.author_id, group_id=post.group_id,
+                image=post.image.name,
+                image_placeholder=post.image_placeholder)
+            for post in posts
+        )
+        ArchivedComment.objects.bulk_create(
+            (ArchivedComment(
+                pk=comment.pk, post_id=comment.post_id,
+                author_id=comment.author_id, text=comment.text,
+                created=comment.created)
+             for comment in Comment.objects.filter(
+                 post__in=posts).iterator()),
+            batch_size=batch_size
+        )
+        ids = [post.pk for post in posts]
+        unread_keys = notifications.unread_keys(
+            Notification.objects.filter(post_id__in=ids))
+        with signals.archiving():
+            Post.objects.filter(pk__in=ids).delete()
+    cache.delete_many(unread_keys)
+    return len(posts)
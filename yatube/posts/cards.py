@@ -0,0 +1,104 @@
+from django.db.models import Count, F
+
+from . import tasks
+from .models import Post, PostCard
+
+
+def card_fields(post):
+    group = post.group
+    return {
+        'author_id': post.author_id,
+        'group_id': post.group_id,
+        'author_name': post.author.get_full_name(),
+        'author_username': post.author.username,
+        'group_slug': group.slug if group else '',
+        'group_title': group.title if group else '',
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'image': post.image.name or '',
+    }
+
+
+def as_cards(posts):
+    """Несохранённые карточки для постов, прочитанных в обход PostCard.
+
+    Так архивные посты выводятся тем же шаблоном, что и горячие. Число
+    комментариев берётся из аннотации comment_total, готовые карточки
+    возвращаются как есть.
+    """
+    return [
+        post if isinstance(post, PostCard) else PostCard(
+            post_id=post.pk, image_placeholder=post.image_placeholder,
+            comment_count=getattr(post, 'comment_total', 0),
+            **card_fields(post))
+        for post in posts
+    ]
+
+
+def save_card(post, created=False):
+    """Создаёт или обновляет карточку по сохранённому посту.
+
+    При смене картинки заглушка и адреса миниатюр сбрасываются: их
+    заново заполнит фоновая подготовка вариантов.
+    """
+    fields = card_fields(post)
+    if not created:
+        PostCard.objects.filter(pk=post.pk).exclude(
+            image=fields['image']).update(
+            image_placeholder='', image_src='', image_srcset='',
+            image_webp_srcset='')
+        if PostCard.objects.filter(pk=post.pk).update(**fields):
+            return
+    PostCard.objects.create(
+        post_id=post.pk, image_placeholder=post.image_placeholder,
+        comment_count=post.comments.count() if not created else 0,
+        **fields)
+
+
+def comments_changed(post_id, delta):
+    cards = PostCard.objects.filter(pk=post_id)
+    if delta < 0:
+        cards = cards.filter(comment_count__gte=-delta)
+    cards.update(comment_count=F('comment_count') + delta)
+
+
+def author_changed(user):
+    name = user.get_full_name()
+    PostCard.objects.filter(author_id=user.pk).exclude(
+        author_name=name, author_username=user.username).update(
+        author_name=name, author_username=user.username)
+
+
+def group_changed(group):
+    PostCard.objects.filter(group_id=group.pk).exclude(
+        group_slug=group.slug, group_title=group.title).update(
+        group_slug=group.slug, group_title=group.title)
+
+
+def group_deleted(group):
+    PostCard.objects.filter(group_id=group.pk).update(
+        group=None, group_slug='', group_title='')
+
+
+def rebuild(posts=None, batch_size=500):
+    """Пересобирает карточки постов пачками по первичному ключу.
+
+    Нужна после bulk_create и правок в обход сигналов. Адреса миниатюр
+    заполнит поставленная для каждой картинки задача warm_post_image.
+    """
+    if posts is None:
+        posts = Post.objects.all()
+    posts = posts.select_related('author', 'group').annotate(
+        comment_total=Count('comments')).order_by('pk')
+    last = 0
+    total = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last)[:batch_size])
+        if not batch:
+            return total
+        last = batch[-1].pk
+        PostCard.objects.filter(pk__in=[post.pk for post in batch]).delete()
+        PostCard.objects.bulk_create(as_cards(batch))
+        for name in {post.image.name for post in batch if post.image}:
+            tasks.warm_post_image.delay(name)
+        total += len(batch)
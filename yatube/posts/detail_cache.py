@@ -0,0 +1,92 @@
+import time
+
+from django.core.cache import cache
+
+from .models import ArchivedPost, Post
+
+POST_CACHE_TIMEOUT = 10 * 60
+COMMENTS_PER_PAGE = 50
+
+
+def _version_key(post_id):
+    return f'post:{post_id}:version'
+
+
+def _author_count_key(author_id):
+    return f'post:author:{author_id}:count'
+
+
+def post_version(post_id):
+    """Версия записи поста в кеше.
+
+    Начальная версия берётся из часов: если ключ версии вытеснен из кеша,
+    записи со старыми версиями больше не найдутся.
+    """
+    key = _version_key(post_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def forget_post(post_id):
+    try:
+        cache.incr(_version_key(post_id))
+    except ValueError:
+        pass
+
+
+def forget_author(author_id):
+    cache.delete(_author_count_key(author_id))
+
+
+def comments_page(post, after=0):
+    """Комментарии поста с id больше after и курсор следующей страницы."""
+    comments = list(post.comments.select_related('author').filter(
+        pk__gt=after).order_by('pk')[:COMMENTS_PER_PAGE + 1])
+    has_next = len(comments) > COMMENTS_PER_PAGE
+    comments = comments[:COMMENTS_PER_PAGE]
+    return {
+        'comments': comments,
+        'comments_cursor': comments[-1].pk if has_next else None,
+    }
+
+
+def _load(post_id):
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id).first()
+    if post is None:
+        post = ArchivedPost.objects.select_related(
+            'author', 'group').filter(pk=post_id).first()
+        if post is None:
+            return None
+    return {
+        'post': post,
+        **comments_page(post),
+        'is_archived': isinstance(post, ArchivedPost),
+    }
+
+
+def get_post_detail(post_id):
+    """Пост с автором, группой и первой страницей комментариев.
+
+    На попадании в кеш база не читается. Запись сбрасывают сигналы при
+    правке и удалении поста и его комментариев. Возвращает None, если
+    поста нет ни в Post, ни в архиве.
+    """
+    key = f'post:{post_id}:v{post_version(post_id)}'
+    detail = cache.get(key)
+    if detail is None:
+        detail = _load(post_id)
+        if detail is None:
+            return None
+        cache.set(key, detail, POST_CACHE_TIMEOUT)
+    author = detail['post'].author
+    return {
+        **detail,
+        'author_post_count': cache.get_or_set(
+            _author_count_key(author.pk),
+            lambda: author.posts.count() + author.archived_posts.count(),
+            POST_CACHE_TIMEOUT),
+    }
@@ -0,0 +1,125 @@
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from . import lookups
+from .models import Post
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние посты'
+    link = reverse_lazy('posts:index')
+    description = 'Новые посты всех авторов'
+
+    def items(self, obj):
+        return Post.objects.select_related('author', 'group').order_by(
+            '-pk')[:FEED_SIZE]
+
+    def item_title(self, item):
+        return truncatechars(item.text, 50)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.pk,))
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return lookups.get_group_or_404(slug)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=(obj.slug,))
+
+    def description(self, obj):
+        return obj.description
+
+    def items(self, obj):
+        return obj.posts.select_related('author', 'group').order_by(
+            '-pk')[:FEED_SIZE]
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return lookups.get_user_or_404(username)
+
+    def title(self, obj):
+        return f'Yatube: посты {obj.get_full_name() or obj.username}'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=(obj.username,))
+
+    def description(self, obj):
+        return f'Новые посты пользователя {obj.username}'
+
+    def items(self, obj):
+        return obj.posts.select_related('author', 'group').order_by(
+            '-pk')[:FEED_SIZE]
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def cached_feed(feed, scope):
+    """Лента с условным GET и кешем тела по id последнего поста.
+
+    Неизменившийся опрос стоит одного запроса последней строки по индексу
+    и ответа 304; тело ленты живёт в кеше, пока в её области не появится
+    новый пост.
+    scope по аргументам URL возвращает фильтр постов области.
+    """
+    def newest(request, **kwargs):
+        if not hasattr(request, 'newest_post'):
+            request.newest_post = Post.objects.filter(
+                **scope(**kwargs)).order_by('-pk').values(
+                'pk', 'pub_date').first() or {'pk': None, 'pub_date': None}
+        return request.newest_post
+
+    def etag(request, **kwargs):
+        return f'{feed.feed_type.__name__}-{newest(request, **kwargs)["pk"]}'
+
+    def last_modified(request, **kwargs):
+        return newest(request, **kwargs)['pub_date']
+
+    @condition(etag_func=etag, last_modified_func=last_modified)
+    def view(request, **kwargs):
+        key = f'feed:{request.path}:{newest(request, **kwargs)["pk"]}'
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, **kwargs)
+            cache.set(key, response, FEED_CACHE_TIMEOUT)
+        return response
+
+    return view
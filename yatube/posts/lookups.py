@@ -0,0 +1,17 @@
+from core.local_cache import LocalCache
+
+from . import missing
+from .models import Group, User
+
+groups_by_slug = LocalCache('group_by_slug')
+users_by_username = LocalCache('user_by_username')
+
+
+def get_group_or_404(slug):
+    return groups_by_slug.get(
+        slug, lambda: missing.get_or_404(Group, 'slug', slug))
+
+
+def get_user_or_404(username):
+    return users_by_username.get(
+        username, lambda: missing.get_or_404(User, 'username', username))
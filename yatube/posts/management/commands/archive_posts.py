@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import archival
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит посты старше заданного возраста вместе с комментариями '
+        'в архивные таблицы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=archival.ARCHIVE_AFTER_DAYS)
+        parser.add_argument(
+            '--batch-size', type=int, default=archival.ARCHIVE_BATCH_SIZE)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах.')
+
+    def handle(self, *args, **options):
+        cutoff = archival.archive_cutoff(options['days'])
+        moved = 0
+        while True:
+            batch = archival.archive_batch(cutoff, options['batch_size'])
+            if not batch:
+                break
+            moved += batch
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(
+            f'Перенесено в архив постов: {moved} (до {cutoff:%d.%m.%Y})')
@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.management.base import BaseCommand
+
+from posts import media
+from posts.models import Post
+
+
+def try_make_placeholder(name):
+    try:
+        return media.make_placeholder(name)
+    except (SuspiciousFileOperation, OSError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Вычисляет заглушки для картинок уже опубликованных постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        pending = Post.objects.exclude(image='').filter(
+            image_placeholder='').order_by('image').values_list(
+            'image', flat=True).distinct()
+        done = failed = 0
+        last = ''
+        # Декодирование и сжатие в Pillow отпускают GIL, поэтому потоков
+        # достаточно; база трогается только из основного потока.
+        with ThreadPoolExecutor(options['workers']) as executor:
+            while True:
+                names = list(
+                    pending.filter(image__gt=last)[:options['batch_size']])
+                if not names:
+                    break
+                last = names[-1]
+                placeholders = executor.map(try_make_placeholder, names)
+                for name, placeholder in zip(names, placeholders):
+                    if placeholder is None:
+                        failed += 1
+                        continue
+                    media.save_placeholder(name, placeholder)
+                    done += 1
+        self.stdout.write(f'Заглушек сохранено: {done}, ошибок: {failed}')
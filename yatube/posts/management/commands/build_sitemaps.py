@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит индекс и шарды карты сайта для постов, профилей и групп. '
+        'Переписываются только шарды, изменившиеся с прошлого запуска.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default=settings.SITE_URL)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Переписать все шарды.')
+
+    def handle(self, *args, **options):
+        written, removed = sitemaps.build(
+            settings.SITEMAP_ROOT, options['base_url'], options['force'])
+        self.stdout.write(
+            f'Шардов записано: {len(written)}, удалено: {len(removed)}')
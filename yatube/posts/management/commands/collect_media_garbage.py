@@ -0,0 +1,117 @@
+import heapq
+import os
+import posixpath
+import shutil
+import time
+
+from django.core.management.base import BaseCommand
+from sorl.thumbnail import default as thumbnail_default
+from sorl.thumbnail.images import ImageFile
+
+from posts.models import ArchivedPost, MediaFile, Post
+from posts.storage import post_image_storage
+
+
+def walk_sorted(root, relative):
+    """Обходит каталог в том же порядке, в каком SQLite сортирует пути.
+
+    Каталог сравнивается как имя с завершающим '/', поэтому глубинный обход
+    с отсортированными записями даёт глобально отсортированный поток путей,
+    а в памяти держится только содержимое текущих каталогов.
+    """
+    try:
+        with os.scandir(os.path.join(root, relative)) as entries:
+            entries = sorted(
+                ((entry.name + '/' if entry.is_dir(follow_symlinks=False)
+                  else entry.name), entry)
+                for entry in entries
+            )
+    except FileNotFoundError:
+        return
+    for sort_name, entry in entries:
+        name = posixpath.join(relative, entry.name)
+        if sort_name.endswith('/'):
+            yield from walk_sorted(root, name)
+        else:
+            yield name, entry
+
+
+def referenced_names(model):
+    return model.objects.exclude(image='').order_by('image').values_list(
+        'image', flat=True).distinct().iterator()
+
+
+def unreferenced(files, referenced):
+    current = next(referenced, None)
+    for name, entry in files:
+        while current is not None and current < name:
+            current = next(referenced, None)
+        if current != name:
+            yield name, entry
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет или переносит в карантин картинки постов, на которые '
+        'не ссылается ни один пост, вместе с их миниатюрами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только вывести найденные файлы.')
+        parser.add_argument(
+            '--quarantine', metavar='DIR',
+            help='Переносить файлы в каталог вместо удаления.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--min-age', type=int, default=60 * 60,
+            help='Не трогать файлы моложе N секунд: пост с ними может '
+                 'ещё не быть сохранён.')
+        parser.add_argument('--prefix', default='posts')
+        parser.add_argument(
+            '--cleanup-thumbnails', action='store_true',
+            help='Дополнительно удалить миниатюры уже отсутствующих файлов.')
+
+    def handle(self, *args, **options):
+        root = post_image_storage.location
+        referenced = heapq.merge(
+            referenced_names(Post), referenced_names(ArchivedPost))
+        deadline = time.time() - options['min_age']
+        found = 0
+        batch = []
+        for name, entry in unreferenced(
+                walk_sorted(root, options['prefix']), referenced):
+            if entry.stat(follow_symlinks=False).st_mtime > deadline:
+                continue
+            found += 1
+            if options['dry_run']:
+                self.stdout.write(name)
+                continue
+            batch.append(name)
+            if len(batch) >= options['batch_size']:
+                self.collect(batch, options['quarantine'])
+                batch = []
+        if batch:
+            self.collect(batch, options['quarantine'])
+        if options['cleanup_thumbnails'] and not options['dry_run']:
+            thumbnail_default.kvstore.cleanup()
+        verb = 'найдено' if options['dry_run'] else 'обработано'
+        self.stdout.write(f'Неиспользуемых файлов {verb}: {found}')
+
+    def collect(self, names, quarantine):
+        # Пока шёл обход, новый пост мог сослаться на тот же файл.
+        names = set(names)
+        for model in (Post, ArchivedPost):
+            names -= set(model.objects.filter(
+                image__in=names).values_list('image', flat=True))
+        for name in names:
+            image = ImageFile(name, post_image_storage)
+            thumbnail_default.kvstore.delete(image)
+            if quarantine:
+                target = os.path.join(quarantine, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(post_image_storage.path(name), target)
+            else:
+                post_image_storage.delete(name)
+        MediaFile.objects.filter(name__in=names).delete()
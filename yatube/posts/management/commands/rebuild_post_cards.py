@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts import cards
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает карточки постов для лент, например после массовой '
+        'загрузки постов в обход сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = cards.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(f'Карточек пересобрано: {total}')
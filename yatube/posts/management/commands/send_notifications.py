@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import notifications
+
+
+class Command(BaseCommand):
+    help = 'Рассылает подписчикам уведомления о новых постах пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int,
+            default=notifications.FAN_OUT_CHUNK_SIZE)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новые посты.')
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            chunks = notifications.fan_out_all(options['chunk_size'])
+            total += chunks
+            if not options['loop']:
+                break
+            if not chunks:
+                time.sleep(options['interval'])
+        self.stdout.write(f'Пачек уведомлений записано: {total}')
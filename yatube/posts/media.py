@@ -0,0 +1,126 @@
+import base64
+import logging
+from io import BytesIO
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from PIL import Image, ImageOps
+from sorl.thumbnail import delete as delete_thumbnails, get_thumbnail
+from sorl.thumbnail.images import ImageFile
+
+from . import detail_cache
+from .models import MediaFile, Post, PostCard
+from .storage import post_image_storage
+
+logger = logging.getLogger(__name__)
+
+# Кадр карточки поста 960x339 в нескольких ширинах и форматах для srcset.
+POST_IMAGE_SIZE = (960, 339)
+POST_IMAGE_WIDTHS = (360, 640, 960)
+POST_IMAGE_FORMATS = ('WEBP', 'JPEG')
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def acquire(name):
+    if not name:
+        return
+    files = MediaFile.objects.filter(name=name)
+    if files.update(ref_count=F('ref_count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            MediaFile.objects.create(name=name, ref_count=1)
+    except IntegrityError:
+        # Ту же картинку одновременно загрузил другой запрос.
+        files.update(ref_count=F('ref_count') + 1)
+
+
+def release(name):
+    """Снимает ссылку; возвращает True, если ссылок не осталось и файл
+    пора удалить.
+
+    Для файлов без записи в MediaFile ничего не делаем: безопаснее оставить
+    файл, чем удалить чужой.
+    """
+    if not name:
+        return False
+    MediaFile.objects.filter(name=name, ref_count__gt=0).update(
+        ref_count=F('ref_count') - 1)
+    return bool(MediaFile.objects.filter(name=name, ref_count=0).delete()[0])
+
+
+def delete_file(name):
+    if MediaFile.objects.filter(name=name).exists():
+        return
+    try:
+        delete_thumbnails(ImageFile(name, post_image_storage))
+    except (SuspiciousFileOperation, OSError):
+        pass
+
+
+def post_image_variants(image, image_format):
+    width, height = POST_IMAGE_SIZE
+    return [
+        (variant_width, get_thumbnail(
+            image, f'{variant_width}x{round(variant_width * height / width)}',
+            crop='center', upscale=True, format=image_format))
+        for variant_width in POST_IMAGE_WIDTHS
+    ]
+
+
+def srcsets(image):
+    """Адреса для <picture>: крупный JPEG и наборы srcset JPEG и WebP."""
+    variants = {
+        image_format: post_image_variants(image, image_format)
+        for image_format in POST_IMAGE_FORMATS
+    }
+    jpeg = variants['JPEG']
+    return {
+        'webp_srcset': ', '.join(
+            f'{thumbnail.url} {variant_width}w'
+            for variant_width, thumbnail in variants['WEBP']),
+        'srcset': ', '.join(
+            f'{thumbnail.url} {variant_width}w'
+            for variant_width, thumbnail in jpeg),
+        'src': jpeg[-1][1].url,
+    }
+
+
+def warm_variants(name):
+    """Заранее строит все варианты картинки, чтобы лента их не ждала."""
+    if not name:
+        return
+    image = ImageFile(name, post_image_storage)
+    try:
+        urls = srcsets(image)
+        PostCard.objects.filter(image=name).update(
+            image_src=urls['src'], image_srcset=urls['srcset'],
+            image_webp_srcset=urls['webp_srcset'])
+        save_placeholder(name, make_placeholder(name))
+    except (SuspiciousFileOperation, OSError) as error:
+        logger.warning('Не удалось подготовить миниатюры %s: %s', name, error)
+
+
+def make_placeholder(name):
+    """Сжимает кадр карточки до нескольких сотен байт JPEG в data URI."""
+    width, height = POST_IMAGE_SIZE
+    size = (PLACEHOLDER_WIDTH, round(PLACEHOLDER_WIDTH * height / width))
+    with post_image_storage.open(name) as source:
+        image = Image.open(source)
+        image.draft('RGB', (size[0] * 8, size[1] * 8))
+        image = ImageOps.fit(image.convert('RGB'), size)
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def save_placeholder(name, placeholder):
+    posts = Post.objects.filter(image=name)
+    post_ids = list(posts.values_list('pk', flat=True))
+    posts.update(image_placeholder=placeholder)
+    PostCard.objects.filter(image=name).update(image_placeholder=placeholder)
+    for post_id in post_ids:
+        detail_cache.forget_post(post_id)
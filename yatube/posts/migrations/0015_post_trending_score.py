@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:28
+
+import math
+
+from django.db import migrations, models
+
+
+def fill_trending_score(apps, schema_editor):
+    from posts.trending import COMMENT_WEIGHT, POST_WEIGHT, event_score
+
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    for post in Post.objects.only('pk', 'pub_date').iterator():
+        terms = [event_score(POST_WEIGHT, post.pub_date)] + [
+            event_score(COMMENT_WEIGHT, created)
+            for created in Comment.objects.filter(
+                post_id=post.pk).values_list('created', flat=True)
+        ]
+        top = max(terms)
+        score = top + math.log(sum(math.exp(term - top) for term in terms))
+        Post.objects.filter(pk=post.pk).update(trending_score=score)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_follow_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0, verbose_name='рейтинг популярности'),
+        ),
+        migrations.RunPython(fill_trending_score, migrations.RunPython.noop),
+    ]
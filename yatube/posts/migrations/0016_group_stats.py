@@ -0,0 +1,72 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    GroupAuthorStats = apps.get_model('posts', 'GroupAuthorStats')
+    for group in Group.objects.annotate(
+        post_count=models.Count('posts'),
+        last_post_at=models.Max('posts__pub_date'),
+    ).iterator():
+        GroupStats.objects.create(
+            group_id=group.pk,
+            post_count=group.post_count,
+            last_post_at=group.last_post_at,
+        )
+    GroupAuthorStats.objects.bulk_create(
+        GroupAuthorStats(
+            group_id=row['group_id'],
+            author_id=row['author_id'],
+            post_count=row['post_count'],
+        )
+        for row in apps.get_model('posts', 'Post').objects.filter(
+            group__isnull=False,
+        ).order_by().values('group_id', 'author_id').annotate(
+            post_count=models.Count('pk'),
+        ).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0015_post_trending_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='группа')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='количество постов')),
+                ('last_post_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='последняя активность')),
+            ],
+            options={
+                'ordering': ['-last_post_at', 'group_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GroupAuthorStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='количество постов')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_stats', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_stats', to='posts.Group', verbose_name='группа')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='groupauthorstats',
+            index=models.Index(fields=['group', '-post_count'], name='posts_group_group_i_777893_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupauthorstats',
+            constraint=models.UniqueConstraint(fields=('group', 'author'), name='unique_group_author'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:31
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def fill_archive_months(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    ArchiveMonth = apps.get_model('posts', 'ArchiveMonth')
+    scopes = (
+        ('all', None),
+        ('group', 'group_id'),
+        ('author', 'author_id'),
+    )
+    for scope, field in scopes:
+        posts = Post.objects.order_by()
+        if field == 'group_id':
+            posts = posts.filter(group__isnull=False)
+        fields = ['year', 'month'] + ([field] if field else [])
+        rows = posts.annotate(
+            year=ExtractYear('pub_date'),
+            month=ExtractMonth('pub_date'),
+        ).values(*fields).annotate(post_count=models.Count('pk'))
+        ArchiveMonth.objects.bulk_create(
+            ArchiveMonth(
+                scope=scope,
+                scope_id=row[field] if field else 0,
+                year=row['year'],
+                month=row['month'],
+                post_count=row['post_count'],
+            )
+            for row in rows.iterator()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'все посты'), ('group', 'группа'), ('author', 'автор')], max_length=10, verbose_name='область')),
+                ('scope_id', models.PositiveIntegerField(default=0, verbose_name='id группы или автора')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='месяц')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='количество постов')),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='дата поста'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivemonth',
+            constraint=models.UniqueConstraint(fields=('scope', 'scope_id', 'year', 'month'), name='unique_archive_month'),
+        ),
+        migrations.RunPython(fill_archive_months, migrations.RunPython.noop),
+    ]
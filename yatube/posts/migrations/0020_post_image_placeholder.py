@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_post_image_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_placeholder',
+            field=models.TextField(blank=True, help_text='Крошечная JPEG-копия картинки в виде data URI', verbose_name='заглушка картинки'),
+        ),
+    ]
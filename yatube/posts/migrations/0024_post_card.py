@@ -0,0 +1,79 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_post_cards(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostCard = apps.get_model('posts', 'PostCard')
+    PostCard.objects.bulk_create(
+        (
+            PostCard(
+                post_id=post.pk,
+                author_id=post.author_id,
+                group_id=post.group_id,
+                author_name=(
+                    f'{post.author.first_name} {post.author.last_name}'
+                ).strip(),
+                author_username=post.author.username,
+                group_slug=post.group.slug if post.group else '',
+                group_title=post.group.title if post.group else '',
+                text=post.text,
+                pub_date=post.pub_date,
+                image=post.image.name or '',
+                image_placeholder=post.image_placeholder,
+                comment_count=post.comment_count,
+            )
+            for post in Post.objects.select_related(
+                'author', 'group',
+            ).annotate(
+                comment_count=models.Count('comments'),
+            ).order_by('pk').iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0023_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostCard',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='posts.Post', verbose_name='пост')),
+                ('author_name', models.CharField(blank=True, max_length=301, verbose_name='имя автора')),
+                ('author_username', models.CharField(max_length=150, verbose_name='логин автора')),
+                ('group_slug', models.SlugField(blank=True, db_index=False, verbose_name='адрес группы')),
+                ('group_title', models.CharField(blank=True, max_length=200, verbose_name='название группы')),
+                ('text', models.TextField(verbose_name='текст поста')),
+                ('pub_date', models.DateTimeField(verbose_name='дата поста')),
+                ('image', models.CharField(blank=True, max_length=100, verbose_name='картинка')),
+                ('image_placeholder', models.TextField(blank=True, verbose_name='заглушка картинки')),
+                ('image_src', models.TextField(blank=True, verbose_name='миниатюра')),
+                ('image_srcset', models.TextField(blank=True, verbose_name='варианты JPEG')),
+                ('image_webp_srcset', models.TextField(blank=True, verbose_name='варианты WebP')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='количество комментариев')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_cards', to=settings.AUTH_USER_MODEL, verbose_name='автор поста')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='post_cards', to='posts.Group', verbose_name='группа')),
+            ],
+            options={
+                'ordering': ['-post_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postcard',
+            index=models.Index(fields=['author', '-post'], name='posts_postc_author__c50415_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postcard',
+            index=models.Index(fields=['group', '-post'], name='posts_postc_group_i_1b16f0_idx'),
+        ),
+        migrations.RunPython(fill_post_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:10
+
+import json
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def queue_card_images(apps, schema_editor):
+    Job = apps.get_model('core', 'Job')
+    PostCard = apps.get_model('posts', 'PostCard')
+    now = timezone.now()
+    names = PostCard.objects.exclude(image='').filter(
+        image_src='').order_by('image').values_list(
+        'image', flat=True).distinct()
+    Job.objects.bulk_create(
+        (
+            Job(
+                queue='media',
+                name='posts.tasks.warm_post_image',
+                payload=json.dumps({'args': [name], 'kwargs': {}}),
+                run_after=now,
+            )
+            for name in names.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+        ('posts', '0024_post_card'),
+    ]
+
+    operations = [
+        migrations.RunPython(queue_card_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0025_warm_post_card_images'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postcard',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, verbose_name='дата поста'),
+        ),
+        migrations.AddIndex(
+            model_name='postcard',
+            index=models.Index(fields=['author', 'pub_date'], name='posts_postc_author__aa79f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postcard',
+            index=models.Index(fields=['group', 'pub_date'], name='posts_postc_group_i_b7861d_idx'),
+        ),
+    ]
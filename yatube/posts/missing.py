@@ -0,0 +1,39 @@
+import hashlib
+
+from django.core.cache import cache
+from django.http import Http404
+
+MISSING_TIMEOUT = 60
+
+
+def _key(model, field, value):
+    digest = hashlib.md5(str(value).encode()).hexdigest()
+    return f'missing:{model._meta.label_lower}:{field}:{digest}'
+
+
+def is_missing(model, field, value):
+    return cache.get(_key(model, field, value)) is not None
+
+
+def remember(model, field, value):
+    cache.set(_key(model, field, value), 1, MISSING_TIMEOUT)
+
+
+def forget(model, field, value):
+    cache.delete(_key(model, field, value))
+
+
+def get_or_404(model, field, value):
+    """get_object_or_404 по одному полю с коротким кешем промахов.
+
+    Несуществующее значение на MISSING_TIMEOUT секунд запоминается, и
+    повторные запросы получают 404 без обращения к базе. Запись снимают
+    сигналы сохранения модели.
+    """
+    if is_missing(model, field, value):
+        raise Http404
+    try:
+        return model._default_manager.get(**{field: value})
+    except model.DoesNotExist:
+        remember(model, field, value)
+        raise Http404
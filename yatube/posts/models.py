@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .storage import post_image_storage
+
 User = get_user_model()
 
 
@@ -16,6 +18,7 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField(verbose_name='текст поста')
     pub_date = models.DateTimeField(auto_now_add=True,
+                                    db_index=True,
                                     verbose_name='дата поста')
     author = models.ForeignKey(
         User,
@@ -36,7 +39,19 @@ class Post(models.Model):
     image = models.ImageField(
         'Картинка',
         upload_to='posts/',
-        blank=True
+        storage=post_image_storage,
+        blank=True,
+        db_index=True
+    )
+    image_placeholder = models.TextField(
+        blank=True,
+        verbose_name='заглушка картинки',
+        help_text='Крошечная JPEG-копия картинки в виде data URI'
+    )
+    trending_score = models.FloatField(
+        default=0,
+        db_index=True,
+        verbose_name='рейтинг популярности'
     )
 
     class Meta:
@@ -62,7 +77,7 @@ class Comment(models.Model):
     )
     text = models.TextField(max_length=200, verbose_name='текст комментария')
     created = models.DateTimeField(
-        auto_now_add=True, verbose_name='дата комментария')
+        auto_now_add=True, db_index=True, verbose_name='дата комментария')
 
 
 class Follow(models.Model):
@@ -78,3 +93,241 @@ class Follow(models.Model):
         related_name='following',
         verbose_name='автор постов'
     )
+
+
+class Notification(models.Model):
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='получатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='новый пост'
+    )
+    is_read = models.BooleanField(default=False, verbose_name='прочитано')
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата уведомления')
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [models.Index(fields=['recipient', 'is_read'])]
+
+
+class PostFanOut(models.Model):
+    """Рассылка уведомлений о посте подписчикам, ещё не доведённая до конца."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='fan_out',
+        verbose_name='пост'
+    )
+    last_follow_id = models.PositiveIntegerField(
+        default=0, verbose_name='последняя обработанная подписка')
+
+    class Meta:
+        ordering = ['post_id']
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='группа'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='количество постов')
+    last_post_at = models.DateTimeField(
+        null=True, blank=True, db_index=True,
+        verbose_name='последняя активность')
+
+    class Meta:
+        ordering = ['-last_post_at', 'group_id']
+
+
+class GroupAuthorStats(models.Model):
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='author_stats',
+        verbose_name='группа'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_stats',
+        verbose_name='автор'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='количество постов')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['group', 'author'], name='unique_group_author')
+        ]
+        indexes = [models.Index(fields=['group', '-post_count'])]
+
+
+class ArchiveMonth(models.Model):
+    SCOPE_ALL = 'all'
+    SCOPE_GROUP = 'group'
+    SCOPE_AUTHOR = 'author'
+    SCOPE_CHOICES = (
+        (SCOPE_ALL, 'все посты'),
+        (SCOPE_GROUP, 'группа'),
+        (SCOPE_AUTHOR, 'автор'),
+    )
+
+    scope = models.CharField(
+        max_length=10, choices=SCOPE_CHOICES, verbose_name='область')
+    scope_id = models.PositiveIntegerField(
+        default=0, verbose_name='id группы или автора')
+    year = models.PositiveSmallIntegerField(verbose_name='год')
+    month = models.PositiveSmallIntegerField(verbose_name='месяц')
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='количество постов')
+
+    class Meta:
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'scope_id', 'year', 'month'],
+                name='unique_archive_month')
+        ]
+
+
+class MediaFile(models.Model):
+    name = models.CharField(
+        max_length=255, unique=True, verbose_name='путь к файлу')
+    ref_count = models.PositiveIntegerField(
+        default=0, verbose_name='количество ссылок')
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из Post; id сохраняется прежним."""
+
+    text = models.TextField(verbose_name='текст поста')
+    pub_date = models.DateTimeField(db_index=True, verbose_name='дата поста')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='автор поста'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='archived_posts',
+        verbose_name='группы'
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        storage=post_image_storage,
+        blank=True,
+        db_index=True
+    )
+    image_placeholder = models.TextField(
+        blank=True, verbose_name='заглушка картинки')
+    archived = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата переноса в архив')
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='комментируемый пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='автор комментария'
+    )
+    text = models.TextField(verbose_name='текст комментария')
+    created = models.DateTimeField(verbose_name='дата комментария')
+
+    class Meta:
+        ordering = ['id']
+
+
+class PostCard(models.Model):
+    """Всё, что нужно карточке поста в ленте, одной строкой без JOIN.
+
+    Строки поддерживают сигналы моделей Post, Comment, Group и User,
+    адреса миниатюр записываются после их подготовки.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card',
+        verbose_name='пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='post_cards',
+        verbose_name='автор поста'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='post_cards',
+        verbose_name='группа'
+    )
+    author_name = models.CharField(
+        max_length=301, blank=True, verbose_name='имя автора')
+    author_username = models.CharField(
+        max_length=150, verbose_name='логин автора')
+    group_slug = models.SlugField(
+        blank=True, db_index=False, verbose_name='адрес группы')
+    group_title = models.CharField(
+        max_length=200, blank=True, verbose_name='название группы')
+    text = models.TextField(verbose_name='текст поста')
+    pub_date = models.DateTimeField(
+        db_index=True, verbose_name='дата поста')
+    image = models.CharField(
+        max_length=100, blank=True, verbose_name='картинка')
+    image_placeholder = models.TextField(
+        blank=True, verbose_name='заглушка картинки')
+    image_src = models.TextField(blank=True, verbose_name='миниатюра')
+    image_srcset = models.TextField(
+        blank=True, verbose_name='варианты JPEG')
+    image_webp_srcset = models.TextField(
+        blank=True, verbose_name='варианты WebP')
+    comment_count = models.PositiveIntegerField(
+        default=0, verbose_name='количество комментариев')
+
+    class Meta:
+        ordering = ['-post_id']
+        indexes = [
+            models.Index(fields=['author', '-post']),
+            models.Index(fields=['group', '-post']),
+            models.Index(fields=['author', 'pub_date']),
+            models.Index(fields=['group', 'pub_date']),
+        ]
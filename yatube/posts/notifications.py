@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Follow, Notification, PostFanOut
+
+FAN_OUT_CHUNK_SIZE = 1000
+UNREAD_TIMEOUT = 60 * 60
+
+
+def unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def unread_count(user_id):
+    """Число непрочитанных уведомлений; COUNT только на промахе кеша."""
+    return cache.get_or_set(
+        unread_key(user_id),
+        lambda: Notification.objects.filter(
+            recipient_id=user_id, is_read=False).count(),
+        UNREAD_TIMEOUT)
+
+
+def mark_read(user_id):
+    Notification.objects.filter(
+        recipient_id=user_id, is_read=False).update(is_read=True)
+    cache.set(unread_key(user_id), 0, UNREAD_TIMEOUT)
+
+
+def unread_keys(notifications):
+    """Ключи счётчиков получателей непрочитанных уведомлений выборки.
+
+    Их сбрасывают после удаления уведомлений пачкой или каскадом: такое
+    удаление проходит мимо mark_read и оставило бы в кеше старое число.
+    """
+    return [
+        unread_key(user_id) for user_id in notifications.filter(
+            is_read=False).order_by().values_list(
+            'recipient_id', flat=True).distinct()
+    ]
+
+
+def fan_out_chunk(fan_out, chunk_size=FAN_OUT_CHUNK_SIZE):
+    """Создаёт уведомления для следующей пачки подписчиков автора поста.
+
+    Подписки перебираются по id через индекс автора, позиция сохраняется
+    в той же транзакции, что и уведомления. Возвращает False, когда
+    подписчики кончились и запись о рассылке удалена.
+    """
+    with transaction.atomic():
+        follows = list(Follow.objects.filter(
+            author_id=fan_out.post.author_id, pk__gt=fan_out.last_follow_id
+        ).order_by('pk').values_list('pk', 'user_id')[:chunk_size])
+        if not follows:
+            fan_out.delete()
+            return False
+        Notification.objects.bulk_create(
+            Notification(recipient_id=user_id, post_id=fan_out.post_id)
+            for _, user_id in follows
+        )
+        fan_out.last_follow_id = follows[-1][0]
+        fan_out.save(update_fields=['last_follow_id'])
+    cache.delete_many([unread_key(user_id) for _, user_id in follows])
+    return True
+
+
+def fan_out_all(chunk_size=FAN_OUT_CHUNK_SIZE):
+    chunks = 0
+    for fan_out in PostFanOut.objects.select_related('post'):
+        while fan_out_chunk(fan_out, chunk_size):
+            chunks += 1
+    return chunks
@@ -0,0 +1,218 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from . import (cards, detail_cache, lookups, media, missing, stats, tasks,
+               trending)
+from .models import (ArchivedComment, ArchivedPost, Comment, Group,
+                     GroupStats, Post, PostFanOut, User)
+
+# Поля могли быть отложены через only()/defer(): не догружаем их ради
+# сравнения, а просто не отслеживаем изменения такого поста.
+UNKNOWN = object()
+USER_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+_state = threading.local()
+
+
+@contextmanager
+def archiving():
+    """Посты переносятся в архив: картинки и счётчики остаются за ними."""
+    _state.archiving = True
+    try:
+        yield
+    finally:
+        _state.archiving = False
+
+
+def file_name(value):
+    return getattr(value, 'name', value) or ''
+
+
+def release_image(name):
+    if media.release(name):
+        tasks.delete_post_image.delay(name)
+
+
+def warm_image(name):
+    if name:
+        tasks.warm_post_image.delay(name)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    instance._saved_group_id = instance.__dict__.get('group_id', UNKNOWN)
+    image = instance.__dict__.get('image', UNKNOWN)
+    instance._saved_image = image if image is UNKNOWN else file_name(image)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        trending.bump(instance.pk, trending.POST_WEIGHT, instance.pub_date)
+        PostFanOut.objects.create(post=instance)
+        tasks.fan_out_post.delay(instance.pk)
+        stats.group_post_added(
+            instance.group_id, instance.author_id, instance.pub_date)
+        stats.archive_post_added(
+            stats.archive_scopes(instance.group_id, instance.author_id),
+            instance.pub_date)
+    elif instance._saved_group_id not in (UNKNOWN, instance.group_id):
+        stats.group_post_removed(
+            instance._saved_group_id, instance.author_id, instance.pub_date)
+        stats.group_post_added(
+            instance.group_id, instance.author_id, instance.pub_date)
+        stats.archive_post_removed(
+            stats.archive_scopes(
+                instance._saved_group_id, include_all=False),
+            instance.pub_date)
+        stats.archive_post_added(
+            stats.archive_scopes(instance.group_id, include_all=False),
+            instance.pub_date)
+    # Карточка пишется раньше постановки задачи на миниатюры: задача
+    # заполняет адреса в уже существующей карточке с новой картинкой.
+    cards.save_card(instance, created)
+    image = file_name(instance.image)
+    if created:
+        media.acquire(image)
+        warm_image(image)
+    elif instance._saved_image not in (UNKNOWN, image):
+        release_image(instance._saved_image)
+        media.acquire(image)
+        Post.objects.filter(pk=instance.pk).update(image_placeholder='')
+        warm_image(image)
+    instance._saved_group_id = instance.group_id
+    instance._saved_image = image
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, **kwargs):
+    if created:
+        cards.comments_changed(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    cards.comments_changed(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Group)
+def update_group_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.group_changed(instance)
+
+
+@receiver(pre_delete, sender=Group)
+def clear_group_cards(sender, instance, **kwargs):
+    cards.group_deleted(instance)
+
+
+@receiver(post_save, sender=User)
+def update_author_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.author_changed(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if getattr(_state, 'archiving', False):
+        return
+    release_image(file_name(instance.image))
+    stats.group_post_removed(
+        instance.group_id, instance.author_id, instance.pub_date)
+    stats.archive_post_removed(
+        stats.archive_scopes(instance.group_id, instance.author_id),
+        instance.pub_date)
+
+
+@receiver(post_delete, sender=ArchivedPost)
+def archived_post_deleted(sender, instance, **kwargs):
+    release_image(file_name(instance.image))
+    stats.group_post_removed(
+        instance.group_id, instance.author_id, instance.pub_date)
+    stats.archive_post_removed(
+        stats.archive_scopes(instance.group_id, instance.author_id),
+        instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=ArchivedPost)
+def forget_saved_post(sender, instance, created, **kwargs):
+    detail_cache.forget_post(instance.pk)
+    if created:
+        detail_cache.forget_author(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=ArchivedPost)
+def forget_deleted_post(sender, instance, **kwargs):
+    detail_cache.forget_post(instance.pk)
+    detail_cache.forget_author(instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=ArchivedComment)
+@receiver(post_delete, sender=ArchivedComment)
+def forget_cached_comments(sender, instance, **kwargs):
+    detail_cache.forget_post(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+def forget_missing_post(sender, instance, created, **kwargs):
+    if created:
+        missing.forget(Post, 'pk', instance.pk)
+
+
+@receiver(post_save, sender=Group)
+def forget_missing_group(sender, instance, **kwargs):
+    missing.forget(Group, 'slug', instance.slug)
+
+
+@receiver(post_save, sender=User)
+def forget_missing_user(sender, instance, **kwargs):
+    missing.forget(User, 'username', instance.username)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def forget_cached_groups(sender, **kwargs):
+    lookups.groups_by_slug.invalidate()
+
+
+@receiver(post_init, sender=User)
+def remember_user_names(sender, instance, **kwargs):
+    instance._saved_names = tuple(
+        instance.__dict__.get(field, UNKNOWN) for field in USER_NAME_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def forget_renamed_user(sender, instance, created, **kwargs):
+    # Вход обновляет last_login; из-за него кеш имён не сбрасываем.
+    names = tuple(
+        instance.__dict__.get(field, UNKNOWN) for field in USER_NAME_FIELDS)
+    if not created and names != instance._saved_names:
+        lookups.users_by_username.invalidate()
+    instance._saved_names = names
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, **kwargs):
+    lookups.users_by_username.invalidate()
+
+
+@receiver(post_save, sender=Group)
+def group_created(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        trending.bump(
+            instance.post_id, trending.COMMENT_WEIGHT, instance.created
+        )
@@ -0,0 +1,184 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, F, IntegerField, Sum
+from django.db.models.functions import Cast
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ArchivedPost, Group, Post, User
+
+# Не больше 50 000 адресов в одном файле, как требует протокол sitemaps.
+SHARD_SIZE = 50000
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+SHARD_NAME = re.compile(r'[a-z]+-\d+\.xml\.gz')
+
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_FOOTER = '</urlset>\n'
+
+
+class Section:
+    """Раздел карты сайта, нарезанный на шарды по диапазонам id."""
+
+    def __init__(self, name, querysets, fields, location, lastmod=None,
+                 hashed_fields=()):
+        self.name = name
+        self.querysets = querysets
+        self.fields = fields
+        self.location = location
+        self.lastmod = lastmod
+        self.hashed_fields = hashed_fields
+
+    def fingerprints(self):
+        """Число строк и сумма id каждого шарда одним GROUP BY на таблицу.
+
+        Новая или удалённая строка меняет отпечаток своего шарда, и при
+        следующем запуске переписывается только он. Если адрес зависит
+        не только от id, отпечаток — хеш полей hashed_fields.
+        """
+        if self.hashed_fields:
+            return self._hashed_fingerprints()
+        shards = {}
+        for queryset in self.querysets:
+            rows = queryset.order_by().annotate(
+                shard=Cast(F('pk') / SHARD_SIZE, IntegerField())
+            ).values('shard').annotate(count=Count('pk'), total=Sum('pk'))
+            for row in rows:
+                count, total = shards.get(row['shard'], (0, 0))
+                shards[row['shard']] = (
+                    count + row['count'], total + row['total'])
+        return {
+            shard: list(fingerprint) for shard, fingerprint in shards.items()
+        }
+
+    def _hashed_fingerprints(self):
+        digests = {}
+        for queryset in self.querysets:
+            rows = queryset.order_by('pk').values_list(
+                'pk', *self.hashed_fields).iterator()
+            for row in rows:
+                digest = digests.setdefault(
+                    row[0] // SHARD_SIZE, hashlib.md5())
+                digest.update(repr(row).encode())
+        return {
+            shard: digest.hexdigest() for shard, digest in digests.items()
+        }
+
+    def file_name(self, shard):
+        return f'{self.name}-{shard}.xml.gz'
+
+    def rows(self, shard):
+        low = shard * SHARD_SIZE
+        for queryset in self.querysets:
+            yield from queryset.filter(
+                pk__gte=low, pk__lt=low + SHARD_SIZE
+            ).order_by('pk').values_list(*self.fields).iterator()
+
+    def write(self, path, shard, base_url):
+        temporary = path + '.tmp'
+        with gzip.open(temporary, 'wt', encoding='utf-8') as out:
+            out.write(URLSET_HEADER)
+            for row in self.rows(shard):
+                out.write(
+                    f'<url><loc>{escape(base_url + self.location(row))}'
+                    '</loc>')
+                if self.lastmod is not None:
+                    out.write(f'<lastmod>{self.lastmod(row)}</lastmod>')
+                out.write('</url>\n')
+            out.write(URLSET_FOOTER)
+        os.replace(temporary, path)
+
+
+def sections():
+    return [
+        Section(
+            'posts',
+            [Post.objects.all(), ArchivedPost.objects.all()],
+            ('pk', 'pub_date'),
+            lambda row: reverse('posts:post_detail', args=(row[0],)),
+            lambda row: row[1].date().isoformat()
+        ),
+        Section(
+            'profiles',
+            [User.objects.filter(is_active=True)],
+            ('pk', 'username'),
+            lambda row: reverse('posts:profile', args=(row[1],)),
+            hashed_fields=('username',)
+        ),
+        Section(
+            'groups',
+            [Group.objects.all()],
+            ('pk', 'slug'),
+            lambda row: reverse('posts:group_list', args=(row[1],)),
+            hashed_fields=('slug',)
+        ),
+    ]
+
+
+def _read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as manifest:
+            return json.load(manifest)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_atomic(path, content):
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as out:
+        out.write(content)
+    os.replace(temporary, path)
+
+
+def build(root, base_url, force=False):
+    """Переписывает изменившиеся шарды и индекс карты сайта.
+
+    Возвращает списки записанных и удалённых файлов.
+    """
+    os.makedirs(root, exist_ok=True)
+    base_url = base_url.rstrip('/')
+    old = _read_manifest(root)
+    manifest = {}
+    written = []
+    now = timezone.now().replace(microsecond=0).isoformat()
+    for section in sections():
+        for shard, fingerprint in sorted(section.fingerprints().items()):
+            name = section.file_name(shard)
+            entry = old.get(name)
+            if (force or entry is None
+                    or entry['fingerprint'] != fingerprint
+                    or not os.path.exists(os.path.join(root, name))):
+                section.write(os.path.join(root, name), shard, base_url)
+                entry = {'fingerprint': fingerprint, 'lastmod': now}
+                written.append(name)
+            manifest[name] = entry
+    removed = sorted(set(old) - set(manifest))
+    for name in removed:
+        try:
+            os.remove(os.path.join(root, name))
+        except FileNotFoundError:
+            pass
+    if written or removed or not os.path.exists(
+            os.path.join(root, INDEX_NAME)):
+        _write_atomic(os.path.join(root, INDEX_NAME), ''.join([
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<sitemapindex '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+            *(
+                f'<sitemap><loc>{escape(base_url)}'
+                f'{reverse("posts:sitemap_shard", args=(name,))}</loc>'
+                f'<lastmod>{entry["lastmod"]}</lastmod></sitemap>\n'
+                for name, entry in manifest.items()
+            ),
+            '</sitemapindex>\n',
+        ]))
+    _write_atomic(os.path.join(root, MANIFEST_NAME), json.dumps(manifest))
+    return written, removed
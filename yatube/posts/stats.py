@@ -0,0 +1,110 @@
+from django.db import IntegrityError, transaction
+from django.db.models import DateTimeField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import ArchiveMonth, GroupAuthorStats, GroupStats, Post
+
+TOP_AUTHORS = 3
+
+
+def _increment(rows, fields, **changes):
+    """UPDATE счётчика, а если строки ещё нет — INSERT с полями fields.
+
+    Первые посты двух параллельных запросов могут оба не найти строку:
+    тогда второй INSERT упирается в уникальность, и прибавка
+    повторяется через UPDATE.
+    """
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            rows.model.objects.create(**fields)
+    except IntegrityError:
+        rows.update(**changes)
+
+
+def group_post_added(group_id, author_id, pub_date):
+    if group_id is None:
+        return
+    moment = Value(pub_date, output_field=DateTimeField())
+    _increment(
+        GroupStats.objects.filter(group_id=group_id),
+        {'group_id': group_id, 'post_count': 1, 'last_post_at': pub_date},
+        post_count=F('post_count') + 1,
+        last_post_at=Greatest(Coalesce('last_post_at', moment), moment))
+    _increment(
+        GroupAuthorStats.objects.filter(
+            group_id=group_id, author_id=author_id),
+        {'group_id': group_id, 'author_id': author_id, 'post_count': 1},
+        post_count=F('post_count') + 1)
+
+
+def group_post_removed(group_id, author_id, pub_date):
+    if group_id is None:
+        return
+    GroupStats.objects.filter(group_id=group_id, post_count__gt=0).update(
+        post_count=F('post_count') - 1)
+    # Последнюю активность пересчитываем только если ушёл самый свежий пост.
+    stale = GroupStats.objects.filter(
+        group_id=group_id, last_post_at__lte=pub_date)
+    if stale.exists():
+        latest = Post.objects.filter(group_id=group_id).order_by(
+            '-pub_date').values_list('pub_date', flat=True).first()
+        stale.update(last_post_at=latest)
+    author_stats = GroupAuthorStats.objects.filter(
+        group_id=group_id, author_id=author_id)
+    if not author_stats.filter(post_count__gt=1).update(
+            post_count=F('post_count') - 1):
+        author_stats.delete()
+
+
+def attach_top_authors(stats_list):
+    """Одним запросом подтягивает самых активных авторов для страницы групп."""
+    top = GroupAuthorStats.objects.filter(
+        pk__in=Subquery(
+            GroupAuthorStats.objects.filter(
+                group_id=OuterRef('group_id')
+            ).order_by('-post_count', 'author_id').values('pk')[:TOP_AUTHORS]
+        ),
+        group_id__in=[stats.group_id for stats in stats_list],
+    ).select_related('author').order_by('-post_count', 'author_id')
+    by_group = {}
+    for author_stats in top:
+        by_group.setdefault(author_stats.group_id, []).append(author_stats)
+    for stats in stats_list:
+        stats.top_authors = by_group.get(stats.group_id, [])
+    return stats_list
+
+
+def archive_scopes(group_id=None, author_id=None, include_all=True):
+    scopes = [(ArchiveMonth.SCOPE_ALL, 0)] if include_all else []
+    if author_id is not None:
+        scopes.append((ArchiveMonth.SCOPE_AUTHOR, author_id))
+    if group_id is not None:
+        scopes.append((ArchiveMonth.SCOPE_GROUP, group_id))
+    return scopes
+
+
+def _archive_rows(scope, scope_id, pub_date):
+    moment = timezone.localtime(pub_date)
+    return ArchiveMonth.objects.filter(
+        scope=scope, scope_id=scope_id, year=moment.year, month=moment.month)
+
+
+def archive_post_added(scopes, pub_date):
+    for scope, scope_id in scopes:
+        moment = timezone.localtime(pub_date)
+        _increment(
+            _archive_rows(scope, scope_id, pub_date),
+            {'scope': scope, 'scope_id': scope_id, 'year': moment.year,
+             'month': moment.month, 'post_count': 1},
+            post_count=F('post_count') + 1)
+
+
+def archive_post_removed(scopes, pub_date):
+    for scope, scope_id in scopes:
+        rows = _archive_rows(scope, scope_id, pub_date)
+        if not rows.filter(post_count__gt=1).update(
+                post_count=F('post_count') - 1):
+            rows.delete()
@@ -0,0 +1,38 @@
+import hashlib
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class HashedMediaStorage(FileSystemStorage):
+    """Раскладывает файлы по хешу содержимого: posts/ab/cd/<sha256>.jpg.
+
+    Одинаковые загрузки получают одно и то же имя и хранятся один раз.
+    """
+
+    def hashed_name(self, name, digest):
+        ext = posixpath.splitext(name)[1]
+        return posixpath.join(
+            posixpath.dirname(name), digest[:2], digest[2:4],
+            digest + ext.lower()
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        name = self.hashed_name(name, digest.hexdigest())
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+
+post_image_storage = HashedMediaStorage()
@@ -0,0 +1,23 @@
+from core.jobs import task
+
+from . import media, notifications
+from .models import PostFanOut
+
+
+@task(queue='media')
+def warm_post_image(name):
+    media.warm_variants(name)
+
+
+@task(queue='media')
+def delete_post_image(name):
+    media.delete_file(name)
+
+
+@task()
+def fan_out_post(post_id):
+    """Одна пачка уведомлений; следующая ставится отдельной задачей."""
+    fan_out = PostFanOut.objects.select_related('post').filter(
+        post_id=post_id).first()
+    if fan_out is not None and notifications.fan_out_chunk(fan_out):
+        fan_out_post.delay(post_id)
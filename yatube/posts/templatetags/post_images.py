@@ -0,0 +1,52 @@
+import logging
+
+from django import template
+from sorl.thumbnail.images import ImageFile
+
+from posts import media
+from posts.storage import post_image_storage
+
+logger = logging.getLogger(__name__)
+
+register = template.Library()
+
+
+@register.inclusion_tag('posts/includes/post_image.html')
+def post_image(image, placeholder='', css_class='card-img my-2'):
+    if not image:
+        return {}
+    try:
+        urls = media.srcsets(image)
+    except Exception as error:
+        logger.warning('Не удалось получить миниатюры %s: %s', image, error)
+        return {}
+    width, height = media.POST_IMAGE_SIZE
+    return {
+        **urls,
+        'width': width,
+        'height': height,
+        'css_class': css_class,
+        'placeholder': placeholder,
+    }
+
+
+@register.inclusion_tag('posts/includes/post_image.html')
+def card_image(card, css_class='card-img my-2'):
+    """Картинка карточки по сохранённым адресам миниатюр.
+
+    Пока фоновая задача их не записала, адреса строятся как в post_image.
+    """
+    if not card.image_src:
+        return post_image(
+            card.image and ImageFile(card.image, post_image_storage),
+            card.image_placeholder, css_class)
+    width, height = media.POST_IMAGE_SIZE
+    return {
+        'src': card.image_src,
+        'srcset': card.image_srcset,
+        'webp_srcset': card.image_webp_srcset,
+        'width': width,
+        'height': height,
+        'css_class': css_class,
+        'placeholder': card.image_placeholder,
+    }
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class AdminChangeListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.author, group=cls.group)
+        Comment.objects.create(
+            post=cls.post, author=cls.author, text='Комментарий')
+        Follow.objects.create(user=cls.admin, author=cls.author)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_posts(self, count):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=User.objects.create_user(
+                username=f'user{i}'), group=self.group)
+            for i in range(count)
+        )
+
+    def get_changelist(self, model, **params):
+        url = reverse(f'admin:posts_{model}_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries]
+
+    def test_changelists_open(self):
+        """Списки всех моделей открываются."""
+        for model in ('post', 'group', 'comment', 'follow'):
+            with self.subTest(model=model):
+                self.get_changelist(model)
+
+    def test_no_full_count(self):
+        """Список постов не считает строки таблицы через COUNT."""
+        _, queries = self.get_changelist('post')
+        self.assertFalse(
+            [sql for sql in queries if 'COUNT(' in sql.upper()])
+
+    def test_query_count_does_not_grow(self):
+        """Число запросов списка не зависит от числа постов и авторов."""
+        self.get_changelist('post')
+        _, before = self.get_changelist('post')
+        self.add_posts(5)
+        _, after = self.get_changelist('post')
+        self.assertEqual(len(before), len(after))
+
+    def test_search_by_id_and_author(self):
+        """Число ищется по id, @имя — по автору."""
+        self.add_posts(2)
+        response, _ = self.get_changelist('post', q=str(self.post.pk))
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post])
+        response, _ = self.get_changelist('post', q='@auth')
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post])
+        response, _ = self.get_changelist('comment', q='@auth')
+        self.assertEqual(len(response.context['cl'].result_list), 1)
+
+    def test_filtered_count_is_capped(self):
+        """Результат поиска по тексту считается с ограничением LIMIT."""
+        _, queries = self.get_changelist('post', q='Тестовый')
+        counts = [sql for sql in queries if 'COUNT(' in sql.upper()]
+        self.assertTrue(counts)
+        for sql in counts:
+            self.assertIn('LIMIT', sql.upper())
+
+    def test_dates_not_scanned(self):
+        """Списки не строят даты через DISTINCT по всей таблице."""
+        old = Post.objects.create(text='Старый пост', author=self.author)
+        Post.objects.filter(pk=old.pk).update(
+            pub_date=timezone.now() - timedelta(days=800))
+        for model in ('post', 'comment'):
+            with self.subTest(model=model):
+                _, queries = self.get_changelist(model)
+                self.assertFalse(
+                    [sql for sql in queries if 'DISTINCT' in sql.upper()])
+
+    def test_month_filter(self):
+        """Фильтр по месяцу предлагает месяцы сводки и отбирает посты."""
+        moment = timezone.localtime(self.post.pub_date)
+        value = f'{moment.year}-{moment.month}'
+        response, _ = self.get_changelist('post')
+        self.assertContains(response, f'?month={value}')
+        response, _ = self.get_changelist('post', month=value)
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post])
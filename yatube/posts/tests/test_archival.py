@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import archival, notifications
+from posts.models import (ArchiveMonth, ArchivedComment, ArchivedPost,
+                          Comment, Group, GroupAuthorStats, GroupStats,
+                          MediaFile, Notification, Post)
+
+User = get_user_model()
+
+INDEX_FRAGMENT_URL = reverse('posts:index_fragment')
+
+
+class ArchivalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        self.posts = [
+            Post.objects.create(
+                text=f'Пост номер {i}', author=self.author, group=self.group,
+                image='posts/old.gif' if i == 0 else '')
+            for i in range(14)
+        ]
+        self.old = self.posts[:8]
+        self.old_date = timezone.now() - timedelta(days=800)
+        Post.objects.filter(pk__in=[post.pk for post in self.old]).update(
+            pub_date=self.old_date)
+        self.comment = Comment.objects.create(
+            post=self.old[0], author=self.author, text='Старый комментарий')
+
+    def archive(self):
+        out = StringIO()
+        call_command('archive_posts', '--batch-size=3', stdout=out)
+        return out.getvalue()
+
+    def test_old_posts_moved_with_comments(self):
+        """Старые посты и комментарии переносятся с прежними id."""
+        self.assertIn('Перенесено в архив постов: 8', self.archive())
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertEqual(
+            set(ArchivedPost.objects.values_list('pk', flat=True)),
+            {post.pk for post in self.old})
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedComment.objects.get()
+        self.assertEqual(archived.pk, self.comment.pk)
+        self.assertEqual(archived.post_id, self.old[0].pk)
+
+    def test_counters_kept(self):
+        """Перенос не трогает счётчики групп и ссылки на картинки."""
+        self.archive()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 14)
+        self.assertEqual(
+            MediaFile.objects.get(name='posts/old.gif').ref_count, 1)
+        ArchivedPost.objects.filter(pk=self.old[0].pk).delete()
+        self.assertFalse(
+            MediaFile.objects.filter(name='posts/old.gif').exists())
+
+    def test_archiving_resets_unread_count(self):
+        """Уведомления об архивных постах не остаются в счётчике."""
+        reader = User.objects.create_user(username='reader')
+        Notification.objects.create(recipient=reader, post=self.old[0])
+        self.assertEqual(notifications.unread_count(reader.pk), 1)
+        self.archive()
+        self.assertEqual(notifications.unread_count(reader.pk), 0)
+
+    def test_deleting_archived_post_lowers_counters(self):
+        """Удаление архивного поста уменьшает счётчики групп и месяцев."""
+        post = self.posts[-1]
+        archival.archive_batch(timezone.now() + timedelta(days=1), 100)
+        moment = timezone.localtime(post.pub_date)
+        months = ArchiveMonth.objects.filter(
+            year=moment.year, month=moment.month)
+        ArchivedPost.objects.get(pk=post.pk).delete()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 13)
+        self.assertEqual(
+            GroupAuthorStats.objects.get(
+                group=self.group, author=self.author).post_count, 13)
+        self.assertEqual(
+            sorted(months.values_list('post_count', flat=True)),
+            [13, 13, 13])
+
+    def test_fragment_falls_through_to_archive(self):
+        """Лента дочитывает архив, только когда курсор дошёл до него."""
+        self.archive()
+        response = self.client.get(INDEX_FRAGMENT_URL)
+        self.assertEqual(
+            response.content.decode().count('подробная информация'), 10)
+        self.assertEqual(response['X-Next-Cursor'], str(self.posts[4].pk))
+        response = self.client.get(
+            INDEX_FRAGMENT_URL, {'before': response['X-Next-Cursor']})
+        self.assertEqual(
+            response.content.decode().count('подробная информация'), 4)
+        self.assertNotIn('X-Next-Cursor', response)
+
+    def test_archived_cards_match_hot_cards(self):
+        """Архивные посты выводятся той же карточкой, что и горячие."""
+        self.archive()
+        response = self.client.get(
+            INDEX_FRAGMENT_URL, {'before': self.old[1].pk})
+        self.assertContains(response, 'комментариев: 1')
+        self.assertContains(response, 'все записи группы Группа')
+
+    def test_hot_page_skips_archive(self):
+        """Полная страница горячих постов не обращается к архиву."""
+        Post.objects.filter(pk__in=[post.pk for post in self.old]).update(
+            pub_date=timezone.now())
+        self.archive()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(INDEX_FRAGMENT_URL)
+        self.assertFalse(
+            [q for q in queries if 'archivedpost' in q['sql'].lower()])
+
+    def test_archived_post_detail(self):
+        """Архивный пост открывается без формы комментария."""
+        self.archive()
+        self.client.force_login(self.author)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.old[0].pk,)))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Старый комментарий')
+        self.assertNotContains(
+            response, reverse('posts:add_comment', args=(self.old[0].pk,)))
+
+    def test_archive_month_reads_archive(self):
+        """Страница месяца из архива показывает перенесённые посты."""
+        self.archive()
+        moment = timezone.localtime(self.old_date)
+        response = self.client.get(reverse(
+            'posts:archive_month', args=(moment.year, moment.month)))
+        self.assertEqual(len(response.context['page_obj']), 8)
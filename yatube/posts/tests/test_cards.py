@@ -0,0 +1,171 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Job
+from posts import media, tasks
+from posts.models import Comment, Follow, Group, Post, PostCard
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostCardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='auth', first_name='Лев', last_name='Толстой')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.author, group=cls.group)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def card(self):
+        return PostCard.objects.get(pk=self.post.pk)
+
+    def test_card_created_with_post(self):
+        card = self.card()
+        self.assertEqual(
+            (card.author_name, card.author_username, card.group_slug,
+             card.group_title, card.text),
+            ('Лев Толстой', 'auth', 'group', 'Группа', 'Пост'))
+
+    def test_comment_count_follows_comments(self):
+        comment = Comment.objects.create(
+            post=self.post, author=self.author, text='Комментарий')
+        self.assertEqual(self.card().comment_count, 1)
+        comment.delete()
+        self.assertEqual(self.card().comment_count, 0)
+
+    def test_related_changes_reach_cards(self):
+        """Правки поста, автора и группы переносятся в карточку."""
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.author.first_name = 'Алексей'
+        self.author.save()
+        self.group.title = 'Новая группа'
+        self.group.save()
+        card = self.card()
+        self.assertEqual(
+            (card.text, card.author_name, card.group_title),
+            ('Новый текст', 'Алексей Толстой', 'Новая группа'))
+        self.group.delete()
+        card = self.card()
+        self.assertEqual(
+            (card.group_id, card.group_slug, card.group_title),
+            (None, '', ''))
+
+    def test_lists_read_cards_only(self):
+        """Ленты читают одну таблицу карточек, без JOIN с постами."""
+        follower = User.objects.create_user(username='follower')
+        Follow.objects.create(user=follower, author=self.author)
+        self.client.force_login(follower)
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=('group',)),
+            reverse('posts:profile', args=('auth',)),
+            reverse('posts:follow_index'),
+        ):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertContains(response, 'Лев Толстой')
+                card_queries = [
+                    query['sql'] for query in queries
+                    if 'FROM "posts_postcard"' in query['sql']]
+                self.assertTrue(card_queries)
+                for sql in card_queries:
+                    self.assertNotIn('"posts_post"', sql)
+
+    def test_month_queries_use_indexes(self):
+        """Выборка карточек за месяц идёт по индексу, а не сканом таблицы."""
+        start = self.post.pub_date.replace(day=1)
+        cards = PostCard.objects.filter(
+            pub_date__gte=start, pub_date__lt=start.replace(
+                year=start.year + 1))
+        for queryset in (
+            cards,
+            cards.filter(author=self.author),
+            cards.filter(group=self.group),
+        ):
+            with self.subTest(sql=str(queryset.query)):
+                self.assertIn('SEARCH', queryset.explain())
+
+    def test_profile_counts_cards_once(self):
+        """Счётчик постов профиля берётся из пагинатора."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('posts:profile', args=('auth',)))
+        self.assertEqual(
+            [query['sql'] for query in queries
+             if 'COUNT(' in query['sql'] and 'posts_post' in query['sql']
+             and 'posts_postcard' not in query['sql']], [])
+
+    def test_thumbnails_stored_on_card(self):
+        post = Post.objects.create(
+            text='С картинкой', author=self.author,
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'))
+        media.warm_variants(post.image.name)
+        card = PostCard.objects.get(pk=post.pk)
+        self.assertRegex(card.image_srcset, r' 360w, .+ 640w, .+ 960w$')
+        self.assertTrue(card.image_placeholder)
+        self.assertContains(
+            self.client.get(reverse('posts:index')), card.image_src)
+
+    def test_card_written_before_thumbnails_job(self):
+        """Задача миниатюр, выполненная сразу, застаёт готовую карточку."""
+        with mock.patch.object(
+                tasks.warm_post_image, 'delay', media.warm_variants):
+            post = Post.objects.create(
+                text='С картинкой', author=self.author,
+                image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'))
+        self.assertTrue(PostCard.objects.get(pk=post.pk).image_src)
+
+    def test_rebuild_after_bulk_create(self):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=self.author) for i in range(3))
+        self.assertEqual(PostCard.objects.count(), 1)
+        out = StringIO()
+        call_command('rebuild_post_cards', '--batch-size=2', stdout=out)
+        self.assertIn('Карточек пересобрано: 4', out.getvalue())
+        self.assertEqual(
+            set(PostCard.objects.values_list('pk', flat=True)),
+            set(Post.objects.values_list('pk', flat=True)))
+
+    def test_rebuild_queues_thumbnails(self):
+        Post.objects.bulk_create([Post(
+            text='С картинкой', author=self.author, image='posts/a.gif')])
+        Job.objects.all().delete()
+        call_command('rebuild_post_cards', stdout=StringIO())
+        self.assertEqual(
+            list(Job.objects.values_list('name', 'payload')),
+            [('posts.tasks.warm_post_image',
+              '{"args": ["posts/a.gif"], "kwargs": {}}')])
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание группы')
+        self.post = Post.objects.create(
+            text='Пост в группе', author=self.author, group=self.group)
+        Post.objects.create(text='Пост без группы', author=self.author)
+
+    def test_feeds_render(self):
+        """Ленты RSS и Atom отдают посты своей области."""
+        cases = {
+            reverse('posts:feed_rss'): ('Пост в группе', 'Пост без группы'),
+            reverse('posts:feed_atom'): ('Пост в группе', 'Пост без группы'),
+            reverse('posts:group_feed_rss', args=('group',)): (
+                'Пост в группе',),
+            reverse('posts:group_feed_atom', args=('group',)): (
+                'Пост в группе',),
+            reverse('posts:profile_feed_rss', args=('author',)): (
+                'Пост в группе', 'Пост без группы'),
+            reverse('posts:profile_feed_atom', args=('author',)): (
+                'Пост в группе', 'Пост без группы'),
+        }
+        for url, texts in cases.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.has_header('ETag'))
+                for text in texts:
+                    self.assertContains(response, text)
+        response = self.client.get(
+            reverse('posts:group_feed_rss', args=('group',)))
+        self.assertNotContains(response, 'Пост без группы')
+
+    def test_unchanged_poll_is_304(self):
+        """Повторный опрос с ETag стоит одного запроса и ответа 304."""
+        url = reverse('posts:group_feed_atom', args=('group',))
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_poll_reads_one_row(self):
+        """Опрос читает последний пост по ключу, а не агрегирует ленту."""
+        url = reverse('posts:feed_rss')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        sql = queries[0]['sql']
+        self.assertNotIn('MAX(', sql)
+        self.assertIn('LIMIT 1', sql)
+
+    def test_body_cached_until_new_post(self):
+        """Тело ленты берётся из кеша, пока не появится новый пост."""
+        url = reverse('posts:feed_rss')
+        first = self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        Post.objects.create(text='Совсем новый пост', author=self.author)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Совсем новый пост')
+
+    def test_unknown_group_not_found(self):
+        response = self.client.get(
+            reverse('posts:group_feed_rss', args=('missing',)))
+        self.assertEqual(response.status_code, 404)
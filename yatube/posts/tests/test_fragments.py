@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post
+
+User = get_user_model()
+
+POSTS_PER_PAGE = 10
+INDEX_FRAGMENT_URL = reverse('posts:index_fragment')
+
+
+class FeedFragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='описание'
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост номер {i}', author=cls.author, group=cls.group)
+            for i in range(13)
+        ]
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_fragment_contains_only_cards(self):
+        """Фрагмент отдаёт карточки без общего шаблона страницы."""
+        with self.assertNumQueries(1):
+            response = self.client.get(INDEX_FRAGMENT_URL)
+        html = response.content.decode()
+        self.assertNotIn('<html', html)
+        self.assertEqual(html.count('подробная информация'), POSTS_PER_PAGE)
+        self.assertEqual(
+            response['X-Next-Cursor'], str(self.posts[3].pk))
+
+    def test_cursor_continues_feed(self):
+        """Курсор продолжает ленту с того места, где закончилась страница."""
+        response = self.client.get(
+            INDEX_FRAGMENT_URL, {'before': self.posts[3].pk})
+        html = response.content.decode()
+        self.assertEqual(html.count('подробная информация'), 3)
+        self.assertFalse(response.has_header('X-Next-Cursor'))
+
+    def test_all_feeds_have_fragments(self):
+        urls = (
+            reverse('posts:group_fragment', args=(self.group.slug,)),
+            reverse('posts:profile_fragment', args=(self.author.username,)),
+            reverse('posts:follow_fragment'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.reader_client.get(url)
+                self.assertEqual(
+                    response.content.decode().count('подробная информация'),
+                    POSTS_PER_PAGE)
+
+    def test_page_starts_infinite_scroll(self):
+        """Страница ленты передаёт курсор для подгрузки следующих карточек."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.context['next_cursor'], self.posts[3].pk)
+        self.assertContains(response, f'data-next="{self.posts[3].pk}"')
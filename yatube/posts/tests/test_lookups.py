@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts import lookups
+from posts.models import Group
+
+User = get_user_model()
+
+
+class LookupCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+
+    def setUp(self):
+        cache.clear()
+
+    def queried_tables(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return ' '.join(query['sql'] for query in queries)
+
+    def test_repeated_lookup_skips_database(self):
+        """Группа по slug и автор по имени читаются из памяти процесса."""
+        for url, table in (
+            (reverse('posts:group_list', args=('group',)), 'posts_group'),
+            (reverse('posts:profile', args=('auth',)), 'auth_user'),
+        ):
+            with self.subTest(url=url):
+                self.assertIn(f'FROM "{table}"', self.queried_tables(url))
+                self.assertNotIn(f'FROM "{table}"', self.queried_tables(url))
+
+    def test_save_invalidates(self):
+        url = reverse('posts:group_list', args=('group',))
+        self.client.get(url)
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.assertContains(self.client.get(url), 'Новое название')
+
+    def test_login_keeps_user_cache(self):
+        """Вход пользователя не сбрасывает кеш имён, переименование —
+        сбрасывает."""
+        users = lookups.users_by_username
+        self.client.get(reverse('posts:profile', args=('auth',)))
+        version = cache.get(users.version_key)
+        self.client.force_login(self.user)
+        self.assertEqual(cache.get(users.version_key), version)
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertNotEqual(cache.get(users.version_key), version)
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class NegativeCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_miss_skips_database(self):
+        """Повторный запрос несуществующего объекта не трогает базу."""
+        urls = (
+            reverse('posts:profile', args=('ghost',)),
+            reverse('posts:group_list', args=('ghost',)),
+            reverse('posts:post_detail', args=(999,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+                with self.assertNumQueries(0):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+    def test_creation_clears_miss(self):
+        """Созданные пользователь, группа и пост сразу становятся видны."""
+        profile = reverse('posts:profile', args=('ghost',))
+        group = reverse('posts:group_list', args=('ghost',))
+        post = reverse('posts:post_detail', args=(999,))
+        for url in (profile, group, post):
+            self.client.get(url)
+        User.objects.create_user(username='ghost')
+        Group.objects.create(title='Группа', slug='ghost', description='-')
+        Post.objects.create(pk=999, text='Пост', author=self.user)
+        for url in (profile, group, post):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_guest_404_is_prerendered(self):
+        """Гостю 404 отдаётся из готового текста с его адресом."""
+        self.client.get('/first-missing/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/second<missing>/')
+        self.assertEqual(response.status_code, 404)
+        self.assertContains(
+            response, '/second&lt;missing&gt;/', status_code=404)
+        self.assertNotContains(response, '/first-missing/', status_code=404)
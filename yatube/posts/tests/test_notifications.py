@@ -0,0 +1,73 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import notifications
+from posts.models import Follow, Notification, Post, PostFanOut
+
+User = get_user_model()
+
+ABOUT_URL = reverse('about:author')
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.followers = [
+            User.objects.create_user(username=f'follower{i}')
+            for i in range(5)
+        ]
+        Follow.objects.bulk_create(
+            Follow(user=follower, author=self.author)
+            for follower in self.followers
+        )
+        self.reader = self.followers[0]
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_post_creation_only_queues_fan_out(self):
+        """Создание поста не пишет уведомления, а ставит рассылку."""
+        post = Post.objects.create(text='Новый пост', author=self.author)
+        self.assertTrue(PostFanOut.objects.filter(post=post).exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_fan_out_in_chunks(self):
+        """Рассылка пишет уведомления пачками и продолжается с места."""
+        post = Post.objects.create(text='Новый пост', author=self.author)
+        fan_out = PostFanOut.objects.get(post=post)
+        self.assertTrue(notifications.fan_out_chunk(fan_out, chunk_size=2))
+        self.assertEqual(Notification.objects.count(), 2)
+        out = StringIO()
+        call_command('send_notifications', '--chunk-size=2', stdout=out)
+        self.assertIn('Пачек уведомлений записано: 2', out.getvalue())
+        self.assertEqual(
+            set(Notification.objects.values_list('recipient', flat=True)),
+            {follower.pk for follower in self.followers})
+        self.assertFalse(PostFanOut.objects.exists())
+
+    def test_badge_from_cached_counter(self):
+        """Счётчик в шапке берётся из кеша и сбрасывается рассылкой."""
+        self.client.get(ABOUT_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(ABOUT_URL)
+        self.assertEqual(response.context['unread_notifications'], 0)
+        Post.objects.create(text='Новый пост', author=self.author)
+        notifications.fan_out_all()
+        response = self.client.get(ABOUT_URL)
+        self.assertContains(response, 'badge bg-danger">1<')
+
+    def test_inbox_marks_read(self):
+        """Страница уведомлений показывает новые и отмечает их прочитанными."""
+        Post.objects.create(text='Новый пост', author=self.author)
+        notifications.fan_out_all()
+        response = self.client.get(reverse('posts:notifications'))
+        self.assertContains(response, 'Новый пост')
+        self.assertContains(response, 'новое')
+        self.assertEqual(notifications.unread_count(self.reader.pk), 0)
+        self.assertFalse(Notification.objects.filter(is_read=False).filter(
+            recipient=self.reader).exists())
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import detail_cache
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class PostDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(
+            text='Исходный текст', author=self.author)
+        self.url = reverse('posts:post_detail', args=(self.post.pk,))
+        self.client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def test_hit_has_no_queries(self):
+        """Повторный показ поста не обращается к базе."""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['post'], self.post)
+        self.assertEqual(response.context['author_post_count'], 1)
+
+    def test_edit_invalidates(self):
+        """Правка поста сразу видна на его странице."""
+        self.client.get(self.url)
+        self.author_client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            {'text': 'Новый текст'})
+        self.assertContains(self.client.get(self.url), 'Новый текст')
+
+    def test_comment_invalidates(self):
+        """Новый комментарий сразу виден на странице поста."""
+        self.client.get(self.url)
+        self.author_client.post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': 'Свежий комментарий'})
+        self.assertContains(self.client.get(self.url), 'Свежий комментарий')
+        Comment.objects.get().delete()
+        self.assertNotContains(
+            self.client.get(self.url), 'Свежий комментарий')
+
+    def test_comments_paginated(self):
+        """Комментарии сверх первой страницы доступны по курсору."""
+        comments = Comment.objects.bulk_create(
+            Comment(
+                post=self.post, author=self.author, text=f'Комментарий {i}')
+            for i in range(detail_cache.COMMENTS_PER_PAGE + 1))
+        response = self.client.get(self.url)
+        self.assertEqual(
+            len(response.context['comments']), detail_cache.COMMENTS_PER_PAGE)
+        cursor = response.context['comments_cursor']
+        self.assertContains(response, f'?comments_after={cursor}')
+        response = self.client.get(self.url, {'comments_after': cursor})
+        self.assertEqual(
+            [comment.text for comment in response.context['comments']],
+            [comments[-1].text])
+        self.assertIsNone(response.context['comments_cursor'])
+
+    def test_delete_invalidates(self):
+        self.client.get(self.url)
+        self.post.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_author_post_count_follows_new_posts(self):
+        """Счётчик постов автора обновляется при новом посте."""
+        self.client.get(self.url)
+        Post.objects.create(text='Второй пост', author=self.author)
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['author_post_count'], 2)
@@ -0,0 +1,130 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts import sitemaps
+from posts.models import Group, Post
+
+User = get_user_model()
+
+TEMP_SITEMAP_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+BASE_URL = 'https://example.com'
+
+
+@override_settings(SITEMAP_ROOT=TEMP_SITEMAP_ROOT)
+@mock.patch('posts.sitemaps.SHARD_SIZE', 3)
+class SitemapTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        self.posts = [
+            Post.objects.create(text=f'Пост {i}', author=self.author)
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+
+    def build(self):
+        return sitemaps.build(TEMP_SITEMAP_ROOT, BASE_URL)
+
+    def read_shard(self, name):
+        with gzip.open(os.path.join(TEMP_SITEMAP_ROOT, name), 'rt') as shard:
+            return shard.read()
+
+    def shard_of(self, post):
+        return f'posts-{post.pk // 3}.xml.gz'
+
+    def test_index_and_shards(self):
+        """Индекс ссылается на шарды, а шарды — на страницы постов."""
+        written, _ = self.build()
+        self.assertIn('profiles-0.xml.gz', written)
+        self.assertIn('groups-0.xml.gz', written)
+        response = self.client.get(reverse('posts:sitemap_index'))
+        index = b''.join(response.streaming_content).decode()
+        for name in written:
+            self.assertIn(
+                BASE_URL + reverse('posts:sitemap_shard', args=(name,)),
+                index)
+        for post in self.posts:
+            self.assertIn(
+                BASE_URL + reverse('posts:post_detail', args=(post.pk,)),
+                self.read_shard(self.shard_of(post)))
+        self.assertIn(
+            '/profile/author/', self.read_shard('profiles-0.xml.gz'))
+
+    def test_only_touched_shards_rewritten(self):
+        """Повторный запуск переписывает только изменившиеся шарды."""
+        self.build()
+        self.assertEqual(self.build(), ([], []))
+        post = self.posts[0]
+        shard, url = self.shard_of(post), reverse(
+            'posts:post_detail', args=(post.pk,))
+        post.delete()
+        self.assertEqual(self.build(), ([shard], []))
+        self.assertNotIn(url, self.read_shard(shard))
+
+    def test_rename_rewrites_shard(self):
+        """Смена slug группы переписывает шард с её адресом."""
+        self.build()
+        self.group.slug = 'renamed'
+        self.group.save()
+        self.assertEqual(self.build(), (['groups-0.xml.gz'], []))
+        self.assertIn('/group/renamed/', self.read_shard('groups-0.xml.gz'))
+
+    def test_only_shards_served(self):
+        """По адресу шардов отдаются только файлы шардов."""
+        self.build()
+        response = self.client.get(
+            reverse('posts:sitemap_shard', args=('groups-0.xml.gz',)))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse(
+            'posts:sitemap_shard', args=(sitemaps.MANIFEST_NAME,)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_response_headers(self):
+        """Шард отдаётся как XML в gzip, индекс — как XML."""
+        self.build()
+        response = self.client.get(
+            reverse('posts:sitemap_shard', args=('groups-0.xml.gz',)))
+        self.assertTrue(response['Content-Type'].startswith('application/xml'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Last-Modified', response)
+        self.assertIn(
+            b'/group/group/',
+            gzip.decompress(b''.join(response.streaming_content)))
+        response = self.client.get(reverse('posts:sitemap_index'))
+        self.assertTrue(response['Content-Type'].startswith('application/xml'))
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_empty_shard_removed(self):
+        self.build()
+        last = self.posts[-1]
+        Post.objects.filter(pk__gte=last.pk // 3 * 3).delete()
+        _, removed = self.build()
+        self.assertEqual(removed, [self.shard_of(last)])
+        self.assertFalse(os.path.exists(
+            os.path.join(TEMP_SITEMAP_ROOT, self.shard_of(last))))
+
+    def test_command_and_robots(self):
+        out = StringIO()
+        call_command('build_sitemaps', stdout=out)
+        self.assertIn('Шардов записано', out.getvalue())
+        response = self.client.get(reverse('posts:robots_txt'))
+        self.assertContains(
+            response, settings.SITE_URL + reverse('posts:sitemap_index'))
@@ -0,0 +1,195 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import stats
+from posts.models import (ArchiveMonth, Group, GroupAuthorStats, GroupStats,
+                          Post)
+
+User = get_user_model()
+
+GROUP_INDEX_URL = reverse('posts:group_index')
+
+
+def racing_update():
+    """QuerySet.update, который при первом вызове для каждой модели не
+    находит строку: её как будто вставили сразу после этого UPDATE."""
+    update = QuerySet.update
+    missed = set()
+
+    def racing(queryset, **kwargs):
+        if queryset.model not in missed:
+            missed.add(queryset.model)
+            return 0
+        return update(queryset, **kwargs)
+    return racing
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other_user = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='описание'
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_create_edit_delete_keep_stats(self):
+        """Счётчики групп меняются при создании, переносе и удалении."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, group=self.group)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 1)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 0)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.other_group).post_count, 1)
+        self.assertFalse(
+            GroupAuthorStats.objects.filter(group=self.group).exists())
+        post.delete()
+        stats = GroupStats.objects.get(group=self.other_group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_post_at)
+
+    def test_author_stats_kept_after_second_to_last_post(self):
+        """Удаление одного из двух постов автора оставляет счётчик 1."""
+        posts = [
+            Post.objects.create(
+                text='Пост', author=self.user, group=self.group)
+            for _ in range(2)
+        ]
+        posts[0].delete()
+        self.assertEqual(
+            GroupAuthorStats.objects.get(
+                group=self.group, author=self.user).post_count, 1)
+
+    def test_concurrent_first_post_counted(self):
+        """Строку вставил параллельный запрос: прибавка не теряется."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, group=self.group)
+        with mock.patch.object(QuerySet, 'update', racing_update()):
+            stats.group_post_added(self.group.pk, self.user.pk, post.pub_date)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 2)
+        self.assertEqual(
+            GroupAuthorStats.objects.get(
+                group=self.group, author=self.user).post_count, 2)
+
+    def test_group_index_shows_top_authors(self):
+        """Каталог групп отдаёт счётчики и авторов из таблиц статистики."""
+        for _ in range(2):
+            Post.objects.create(
+                text='Пост', author=self.user, group=self.group)
+        Post.objects.create(
+            text='Пост', author=self.other_user, group=self.group)
+        response = self.client.get(GROUP_INDEX_URL)
+        stats = response.context['page_obj'][0]
+        self.assertEqual(stats.group, self.group)
+        self.assertEqual(stats.post_count, 3)
+        self.assertEqual(
+            [(s.author, s.post_count) for s in stats.top_authors],
+            [(self.user, 2), (self.other_user, 1)]
+        )
+
+    def test_group_index_query_count(self):
+        """Число запросов каталога не зависит от числа групп."""
+        for index in range(5):
+            group = Group.objects.create(
+                title=f'Группа {index}', slug=f'group-{index}')
+            Post.objects.create(text='Пост', author=self.user, group=group)
+        with self.assertNumQueries(3):
+            self.client.get(GROUP_INDEX_URL)
+
+
+class ArchiveMonthTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='описание'
+        )
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.user, group=cls.group)
+        Post.objects.create(text='Пост без группы', author=cls.user)
+        cls.year = cls.post.pub_date.year
+        cls.month = cls.post.pub_date.month
+
+    def setUp(self):
+        self.client = Client()
+
+    def get_count(self, scope, scope_id):
+        return ArchiveMonth.objects.get(
+            scope=scope, scope_id=scope_id,
+            year=self.year, month=self.month).post_count
+
+    def test_rollup_counts(self):
+        """Сводка по месяцам ведётся для всех постов, группы и автора."""
+        self.assertEqual(self.get_count(ArchiveMonth.SCOPE_ALL, 0), 2)
+        self.assertEqual(
+            self.get_count(ArchiveMonth.SCOPE_GROUP, self.group.pk), 1)
+        self.assertEqual(
+            self.get_count(ArchiveMonth.SCOPE_AUTHOR, self.user.pk), 2)
+        Post.objects.create(text='Ещё пост', author=self.user).delete()
+        self.assertEqual(self.get_count(ArchiveMonth.SCOPE_ALL, 0), 2)
+
+    def test_concurrent_first_post_of_month_counted(self):
+        """Первые посты месяца из параллельных запросов оба учтены."""
+        scope = (ArchiveMonth.SCOPE_GROUP, self.group.pk)
+        with mock.patch.object(QuerySet, 'update', racing_update()):
+            stats.archive_post_added([scope], self.post.pub_date)
+        self.assertEqual(
+            ArchiveMonth.objects.get(
+                scope=scope[0], scope_id=scope[1]).post_count, 2)
+
+    def test_rollup_kept_after_second_to_last_post(self):
+        """Счётчик месяца, уменьшившийся с 2 до 1, не удаляется."""
+        Post.objects.create(
+            text='Ещё пост', author=self.user, group=self.group).delete()
+        self.assertEqual(
+            self.get_count(ArchiveMonth.SCOPE_GROUP, self.group.pk), 1)
+
+    def test_archive_month_pages(self):
+        """Страницы архива за месяц выводят посты нужной области."""
+        urls = {
+            reverse('posts:archive_month', args=(self.year, self.month)): 2,
+            reverse('posts:group_archive_month', args=(
+                self.group.slug, self.year, self.month)): 1,
+            reverse('posts:profile_archive_month', args=(
+                self.user.username, self.year, self.month)): 2,
+        }
+        for url, expected in urls.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(len(response.context['page_obj']), expected)
+
+    def test_archive_sidebar_from_rollup(self):
+        """Боковая панель архива строится из сводной таблицы."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:archive'))
+        self.assertEqual(response.context['years'][0]['post_count'], 2)
+
+    def test_wrong_month_not_found(self):
+        response = self.client.get(
+            reverse('posts:archive_month', args=(self.year, 13)))
+        self.assertEqual(response.status_code, 404)
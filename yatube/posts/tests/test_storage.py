@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+
+from posts import media
+from posts.models import MediaFile, Post
+from posts.storage import post_image_storage
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def upload(name):
+    return SimpleUploadedFile(
+        name=name, content=SMALL_GIF, content_type='image/gif')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class HashedStorageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_same_content_shared(self):
+        """Одинаковые картинки хранятся одним файлом в шард-каталоге."""
+        first = Post.objects.create(
+            text='Первый', author=self.user, image=upload('first.gif'))
+        second = Post.objects.create(
+            text='Второй', author=self.user, image=upload('second.GIF'))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(
+            first.image.name, r'^posts/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}'
+            r'\.gif$')
+        self.assertEqual(
+            MediaFile.objects.get(name=first.image.name).ref_count, 2)
+
+    def test_concurrent_upload_counted(self):
+        """Запись о файле вставил параллельный запрос: ссылка не теряется."""
+        MediaFile.objects.create(name='posts/same.gif', ref_count=1)
+        update = QuerySet.update
+        calls = []
+
+        def racing_update(queryset, **kwargs):
+            # Первый UPDATE не видит строку, вставленную параллельно.
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else update(queryset, **kwargs)
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            media.acquire('posts/same.gif')
+        self.assertEqual(
+            MediaFile.objects.get(name='posts/same.gif').ref_count, 2)
+
+    def test_delete_keeps_shared_file(self):
+        """Файл удаляется только после снятия последней ссылки."""
+        first = Post.objects.create(
+            text='Первый', author=self.user, image=upload('first.gif'))
+        second = Post.objects.create(
+            text='Второй', author=self.user, image=upload('second.gif'))
+        name = first.image.name
+        path = post_image_storage.path(name)
+        first.delete()
+        self.assertEqual(MediaFile.objects.get(name=name).ref_count, 1)
+        media.delete_file(name)
+        self.assertTrue(os.path.exists(path))
+        second.delete()
+        self.assertFalse(MediaFile.objects.filter(name=name).exists())
+        media.delete_file(name)
+        self.assertFalse(os.path.exists(path))
+
+    def test_edit_moves_reference(self):
+        """Замена картинки при редактировании переносит ссылку."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, image=upload('first.gif'))
+        old_name = post.image.name
+        post.image = ''
+        post.save()
+        self.assertFalse(MediaFile.objects.filter(name=old_name).exists())
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class CollectMediaGarbageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Пост', author=self.user, image=upload('kept.gif'))
+        self.orphans = ['posts/aa/bb/orphan.gif', 'posts/zz.gif']
+        for name in self.orphans:
+            path = os.path.join(TEMP_MEDIA_ROOT, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as orphan:
+                orphan.write(SMALL_GIF)
+
+    def tearDown(self):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command(
+            'collect_media_garbage', '--min-age=0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_lists_orphans(self):
+        """Пробный прогон только перечисляет неиспользуемые файлы."""
+        output = self.run_command('--dry-run')
+        for name in self.orphans:
+            self.assertIn(name, output)
+            self.assertTrue(post_image_storage.exists(name))
+        self.assertNotIn(self.post.image.name, output)
+
+    def test_orphans_deleted(self):
+        """Удаляются только файлы без ссылок из постов."""
+        self.run_command('--batch-size=1')
+        for name in self.orphans:
+            self.assertFalse(post_image_storage.exists(name))
+        self.assertTrue(post_image_storage.exists(self.post.image.name))
+
+    def test_orphans_quarantined(self):
+        quarantine = os.path.join(TEMP_MEDIA_ROOT, 'quarantine')
+        self.run_command(f'--quarantine={quarantine}')
+        for name in self.orphans:
+            self.assertTrue(
+                os.path.exists(os.path.join(quarantine, name)))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class BackfillPlaceholdersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def tearDown(self):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_backfill_placeholders(self):
+        """Команда заполняет крошечные заглушки для всех постов с картинкой."""
+        posts = [
+            Post.objects.create(
+                text='Пост', author=self.user, image=upload(f'{i}.gif'))
+            for i in range(2)
+        ]
+        Post.objects.create(
+            text='Битая', author=self.user, image='posts/missing.gif')
+        out = StringIO()
+        call_command('backfill_placeholders', '--batch-size=1', stdout=out)
+        self.assertIn('Заглушек сохранено: 1, ошибок: 1', out.getvalue())
+        for post in posts:
+            post.refresh_from_db()
+            self.assertTrue(
+                post.image_placeholder.startswith('data:image/jpeg;base64,'))
+            self.assertLess(len(post.image_placeholder), 1000)
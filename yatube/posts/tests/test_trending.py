@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import trending
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+TRENDING_URL = reverse('posts:trending')
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.old_post = Post.objects.create(text='Старый пост', author=cls.user)
+        cls.new_post = Post.objects.create(text='Новый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_new_post_ranks_first(self):
+        """Без активности свежий пост выше старого."""
+        response = self.client.get(TRENDING_URL)
+        posts = [card.pk for card in response.context['page_obj']]
+        self.assertEqual(posts, [self.new_post.pk, self.old_post.pk])
+
+    def test_comment_raises_post(self):
+        """Комментарий поднимает пост без пересчёта остальных."""
+        Comment.objects.create(
+            post=self.old_post, author=self.user, text='Комментарий')
+        response = self.client.get(TRENDING_URL)
+        posts = [card.pk for card in response.context['page_obj']]
+        self.assertEqual(posts[0], self.old_post.pk)
+
+    def test_views_flushed_in_batches(self):
+        """Просмотры попадают в рейтинг пачками."""
+        url = reverse('posts:post_detail', args=(self.old_post.pk,))
+        score = Post.objects.get(pk=self.old_post.pk).trending_score
+        for _ in range(trending.VIEWS_FLUSH_EVERY - 1):
+            self.client.get(url)
+        self.assertEqual(
+            Post.objects.get(pk=self.old_post.pk).trending_score, score)
+        self.client.get(url)
+        self.assertGreater(
+            Post.objects.get(pk=self.old_post.pk).trending_score, score)
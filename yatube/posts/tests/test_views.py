@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 from django.core.cache import cache
@@ -8,7 +9,9 @@ from django import forms
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from posts import cards
 from posts.models import Post, Group
+from posts.storage import post_image_storage
 
 
 User = get_user_model()
@@ -29,6 +32,8 @@ SMAIL_GIF = (
     b'\x02\x00\x01\x00\x00\x02\x02\x0C'
     b'\x0A\x00\x3B'
 )
+SMAIL_GIF_NAME = post_image_storage.hashed_name(
+    'posts/small.gif', hashlib.sha256(SMAIL_GIF).hexdigest())
 
 
 @override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
@@ -189,7 +194,8 @@ class PostViewsTests(TestCase):
         for url, response in response_urls.items():
             with self.subTest(url=url):
                 post_page = response.context.get('page_obj')
-                self.assertIn(self.posts[0], post_page)
+                self.assertIn(
+                    self.posts[0].pk, [card.pk for card in post_page])
 
     def test_cache_index(self):
         """Проверка кеширования на главной странице сайта."""
@@ -219,18 +225,27 @@ class PostViewsTests(TestCase):
             with self.subTest(address=address):
                 response = self.authorized_client.get(address)
                 posts = response.context.get('page_obj')
-                self.assertEqual('posts/small.gif', posts[0].image)
+                self.assertEqual(SMAIL_GIF_NAME, posts[0].image)
         response_detail = self.authorized_client.get(reverse(
             'posts:post_detail', kwargs={'post_id': self.post.id}))
         posts_detail = response_detail.context.get('post')
-        self.assertEqual('posts/small.gif', posts_detail.image)
+        self.assertEqual(SMAIL_GIF_NAME, posts_detail.image)
         self.assertTrue(
             Post.objects.filter(
                 text='Текст к картинке',
-                image='posts/small.gif'
+                image=SMAIL_GIF_NAME
             ).exists()
         )
 
+    def test_post_image_srcset(self):
+        """Картинка выводится с srcset, WebP-вариантами и размерами."""
+        response = self.authorized_client.get(reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}))
+        html = response.content.decode()
+        self.assertIn('<source type="image/webp"', html)
+        self.assertRegex(html, r'srcset="[^"]+ 360w, [^"]+ 640w, [^"]+ 960w"')
+        self.assertIn('width="960" height="339" loading="lazy"', html)
+
 
 class PaginatorViewsTest(TestCase):
     @classmethod
@@ -251,6 +266,7 @@ class PaginatorViewsTest(TestCase):
         )
         posts = (post for i in range(1, 14))
         Post.objects.bulk_create(posts)
+        cards.rebuild()
 
     def setUp(self):
         cache.clear()
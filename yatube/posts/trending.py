@@ -0,0 +1,56 @@
+import math
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Exp, Ln
+from django.utils import timezone
+
+from .models import Post, PostCard
+
+# Рейтинг хранится в логарифмической шкале относительно фиксированной эпохи:
+# событие с весом w в момент t даёт ln(w) + (t - EPOCH) * ln2 / HALF_LIFE.
+# Сумма таких слагаемых упорядочивает посты так же, как сумма весов,
+# затухающих с периодом полураспада HALF_LIFE, поэтому пересчитывать
+# старые посты при течении времени не нужно.
+TRENDING_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+TRENDING_HALF_LIFE = 12 * 60 * 60
+
+POST_WEIGHT = 1.0
+COMMENT_WEIGHT = 1.0
+VIEW_WEIGHT = 0.1
+# Просмотры копятся в кеше и сбрасываются в базу пачками.
+VIEWS_FLUSH_EVERY = 10
+VIEWS_KEY_TIMEOUT = 24 * 60 * 60
+
+
+def event_score(weight, moment=None):
+    moment = moment or timezone.now()
+    elapsed = (moment - TRENDING_EPOCH).total_seconds()
+    return math.log(weight) + elapsed * math.log(2) / TRENDING_HALF_LIFE
+
+
+def bump(post_id, weight, moment=None):
+    """Добавляет событие к рейтингу поста одним UPDATE (log-sum-exp)."""
+    score = Value(event_score(weight, moment), output_field=FloatField())
+    one = Value(1.0, output_field=FloatField())
+    Post.objects.filter(pk=post_id).update(
+        trending_score=score + Ln(one + Exp(F('trending_score') - score))
+    )
+
+
+def register_view(post_id):
+    key = f'trending:views:{post_id}'
+    if cache.add(key, 1, VIEWS_KEY_TIMEOUT):
+        views = 1
+    else:
+        try:
+            views = cache.incr(key)
+        except ValueError:
+            return
+    if views % VIEWS_FLUSH_EVERY == 0:
+        bump(post_id, VIEW_WEIGHT * VIEWS_FLUSH_EVERY)
+
+
+def trending_posts():
+    return PostCard.objects.order_by('-post__trending_score', '-post_id')
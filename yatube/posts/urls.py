@@ -5,6 +5,8 @@ from . import views
 app_name = 'posts'
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_list, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
@@ -15,6 +17,89 @@ urlpatterns = [
         views.add_comment,
         name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('notifications/', views.notifications, name='notifications'),
+    path('fragments/', views.index_fragment, name='index_fragment'),
+    path(
+        'fragments/group/<slug:slug>/',
+        views.group_fragment,
+        name='group_fragment'
+    ),
+    path(
+        'fragments/profile/<str:username>/',
+        views.profile_fragment,
+        name='profile_fragment'
+    ),
+    path(
+        'fragments/follow/',
+        views.follow_fragment,
+        name='follow_fragment'
+    ),
+    path('feeds/rss/', views.feed_rss, name='feed_rss'),
+    path('feeds/atom/', views.feed_atom, name='feed_atom'),
+    path(
+        'group/<slug:slug>/rss/',
+        views.group_feed_rss,
+        name='group_feed_rss'
+    ),
+    path(
+        'group/<slug:slug>/atom/',
+        views.group_feed_atom,
+        name='group_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        views.profile_feed_rss,
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        views.profile_feed_atom,
+        name='profile_feed_atom'
+    ),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path(
+        'sitemaps/<str:name>',
+        views.sitemap_shard,
+        name='sitemap_shard'
+    ),
+    path('robots.txt', views.robots_txt, name='robots_txt'),
+    path('archive/', views.archive, name='archive'),
+    path('archive/<int:year>/', views.archive_year, name='archive_year'),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.archive_month,
+        name='archive_month'
+    ),
+    path(
+        'group/<slug:slug>/archive/',
+        views.archive,
+        name='group_archive'
+    ),
+    path(
+        'group/<slug:slug>/archive/<int:year>/',
+        views.archive_year,
+        name='group_archive_year'
+    ),
+    path(
+        'group/<slug:slug>/archive/<int:year>/<int:month>/',
+        views.archive_month,
+        name='group_archive_month'
+    ),
+    path(
+        'profile/<str:username>/archive/',
+        views.archive,
+        name='profile_archive'
+    ),
+    path(
+        'profile/<str:username>/archive/<int:year>/',
+        views.archive_year,
+        name='profile_archive_year'
+    ),
+    path(
+        'profile/<str:username>/archive/<int:year>/<int:month>/',
+        views.archive_month,
+        name='profile_archive_month'
+    ),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -12,4 +12,34 @@ def get_page_context(queryset, request):
         'paginator': paginator,
         'page_number': page_number,
         'page_obj': page_obj,
+        'next_cursor': (
+            page_obj[len(page_obj) - 1].pk if page_obj.has_next() else None),
+    }
+
+
+def _newest_first(queryset):
+    # У PostCard первичный ключ — связь с постом, и order_by('-pk')
+    # подхватил бы сортировку Post, поэтому сортируем по самому столбцу.
+    return queryset.order_by('-' + queryset.model._meta.pk.attname)
+
+
+def get_cursor_page(queryset, request, archive=None):
+    """Страница ленты по курсору: посты с id меньше ?before=.
+
+    В отличие от номера страницы не требует COUNT и OFFSET. Архив
+    читается, только когда курсор дошёл до конца горячих постов.
+    """
+    before = request.GET.get('before')
+    if before and before.isdigit():
+        queryset = queryset.filter(pk__lt=int(before))
+        if archive is not None:
+            archive = archive.filter(pk__lt=int(before))
+    posts = list(_newest_first(queryset)[:POSTS_PER_PAGE + 1])
+    if archive is not None and len(posts) <= POSTS_PER_PAGE:
+        posts += _newest_first(archive)[:POSTS_PER_PAGE + 1 - len(posts)]
+    has_next = len(posts) > POSTS_PER_PAGE
+    posts = posts[:POSTS_PER_PAGE]
+    return {
+        'posts': posts,
+        'next_cursor': posts[-1].pk if has_next else None,
     }
@@ -1,30 +1,63 @@
+import os
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from .utils import get_page_context
-from django.views.decorators.cache import cache_page
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from .utils import get_cursor_page, get_page_context
+
+from core.page_cache import stale_cache_page
 
+from . import (cards, detail_cache, feeds, lookups, missing,
+               notifications as post_notifications, sitemaps, stats,
+               trending as trending_scores)
 from .forms import PostForm, CommentForm
-from .models import Follow, Group, Post, User, Comment
+from .models import (ArchivedPost, ArchiveMonth, Follow, GroupStats,
+                     Notification, Post, PostCard, User)
 
 
-@cache_page(20, key_prefix='index_page')
+@stale_cache_page(20, key_prefix='index_page')
 def index(request):
-    context = get_page_context(Post.objects.all(), request)
+    context = get_page_context(PostCard.objects.all(), request)
+    context['fragment_url'] = reverse('posts:index_fragment')
     return render(request, 'posts/index.html', context)
 
 
+@stale_cache_page(20, key_prefix='trending_page')
+def trending(request):
+    context = get_page_context(trending_scores.trending_posts(), request)
+    return render(request, 'posts/trending.html', context)
+
+
+@stale_cache_page(60, key_prefix='group_index_page')
+def group_index(request):
+    context = get_page_context(
+        GroupStats.objects.select_related('group'), request)
+    page_obj = context['page_obj']
+    page_obj.object_list = stats.attach_top_authors(
+        list(page_obj.object_list))
+    return render(request, 'posts/group_index.html', context)
+
+
 def group_list(request, slug):
     template = 'posts/group_list.html'
-    group = get_object_or_404(Group, slug=slug)
+    group = lookups.get_group_or_404(slug)
     context = {
         'group': group
     }
-    context.update(get_page_context(group.posts.all(), request))
+    context.update(get_page_context(group.post_cards.all(), request))
+    context['fragment_url'] = reverse('posts:group_fragment', args=(slug,))
     return render(request, template, context)
 
 
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = lookups.get_user_or_404(username)
     following = request.user.is_authenticated and Follow.objects.filter(
         user=request.user, author=author
     ).exists()
@@ -32,17 +65,28 @@ def profile(request, username):
         'author': author,
         'following': following
     }
-    context.update(get_page_context(author.posts.all(), request))
+    context.update(get_page_context(author.post_cards.all(), request))
+    context['fragment_url'] = reverse(
+        'posts:profile_fragment', args=(username,))
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    if missing.is_missing(Post, 'pk', post_id):
+        raise Http404
+    detail = detail_cache.get_post_detail(post_id)
+    if detail is None:
+        missing.remember(Post, 'pk', post_id)
+        raise Http404
+    if not detail['is_archived']:
+        trending_scores.register_view(post_id)
+    after = request.GET.get('comments_after')
+    if after and after.isdigit():
+        # В кеше только первая страница, следующие читаются из базы.
+        detail.update(detail_cache.comments_page(detail['post'], int(after)))
     form = CommentForm(request.POST or None)
-    comments = Comment.objects.filter(post=post)
     context = {
-        'post': post,
-        'comments': comments,
+        **detail,
         'form': form
     }
     return render(request, 'posts/post_detail.html', context)
@@ -96,11 +140,25 @@ def add_comment(request, post_id):
 
 @login_required
 def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
-    context = get_page_context(posts, request)
+    context = get_page_context(
+        PostCard.objects.filter(author__following__user=request.user),
+        request)
+    context['fragment_url'] = reverse('posts:follow_fragment')
     return render(request, 'posts/follow.html', context)
 
 
+@login_required
+def notifications(request):
+    context = get_page_context(
+        Notification.objects.filter(recipient=request.user).select_related(
+            'post__author', 'post__group'),
+        request)
+    page_obj = context['page_obj']
+    page_obj.object_list = list(page_obj.object_list)
+    post_notifications.mark_read(request.user.pk)
+    return render(request, 'posts/notifications.html', context)
+
+
 @login_required
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
@@ -114,3 +172,185 @@ def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
     Follow.objects.filter(user=request.user, author=author).delete()
     return redirect('posts:profile', username=username)
+
+
+def _archive_scope(slug=None, username=None):
+    if slug is not None:
+        group = lookups.get_group_or_404(slug)
+        return {
+            'scope': ArchiveMonth.SCOPE_GROUP,
+            'scope_id': group.pk,
+            'group': group,
+            'cards': group.post_cards.all(),
+            'archived_posts': group.archived_posts.all(),
+            'url_name': 'posts:group_archive',
+            'url_kwargs': {'slug': slug},
+        }
+    if username is not None:
+        author = lookups.get_user_or_404(username)
+        return {
+            'scope': ArchiveMonth.SCOPE_AUTHOR,
+            'scope_id': author.pk,
+            'author': author,
+            'cards': author.post_cards.all(),
+            'archived_posts': author.archived_posts.all(),
+            'url_name': 'posts:profile_archive',
+            'url_kwargs': {'username': username},
+        }
+    return {
+        'scope': ArchiveMonth.SCOPE_ALL,
+        'scope_id': 0,
+        'cards': PostCard.objects.all(),
+        'archived_posts': ArchivedPost.objects.all(),
+        'url_name': 'posts:archive',
+        'url_kwargs': {},
+    }
+
+
+def _archive_context(scope, year=None):
+    months = list(ArchiveMonth.objects.filter(
+        scope=scope['scope'], scope_id=scope['scope_id']))
+    years = {}
+    for row in months:
+        row.url = reverse(scope['url_name'] + '_month', kwargs={
+            **scope['url_kwargs'], 'year': row.year, 'month': row.month})
+        years[row.year] = years.get(row.year, 0) + row.post_count
+    return {
+        'group': scope.get('group'),
+        'author': scope.get('author'),
+        'archive_url': reverse(scope['url_name'], kwargs=scope['url_kwargs']),
+        'years': [
+            {
+                'year': archive_year,
+                'post_count': post_count,
+                'url': reverse(scope['url_name'] + '_year', kwargs={
+                    **scope['url_kwargs'], 'year': archive_year}),
+            }
+            for archive_year, post_count in years.items()
+        ],
+        'months': [
+            row for row in months if year is None or row.year == year],
+        'year': year,
+    }
+
+
+def archive(request, slug=None, username=None):
+    context = _archive_context(_archive_scope(slug, username))
+    return render(request, 'posts/archive.html', context)
+
+
+def archive_year(request, year, slug=None, username=None):
+    context = _archive_context(_archive_scope(slug, username), year)
+    return render(request, 'posts/archive.html', context)
+
+
+def archive_month(request, year, month, slug=None, username=None):
+    try:
+        start = timezone.make_aware(datetime(year, month, 1))
+        end = timezone.make_aware(
+            datetime(year + month // 12, month % 12 + 1, 1))
+    except ValueError:
+        raise Http404
+    scope = _archive_scope(slug, username)
+    context = _archive_context(scope, year)
+    context['month'] = start
+    posts = scope['cards'].filter(pub_date__gte=start, pub_date__lt=end)
+    if not posts.exists():
+        # Старые месяцы переносятся в архив целиком.
+        posts = _with_comment_total(scope['archived_posts'].filter(
+            pub_date__gte=start, pub_date__lt=end))
+    context.update(get_page_context(posts, request))
+    page_obj = context['page_obj']
+    page_obj.object_list = cards.as_cards(page_obj.object_list)
+    return render(request, 'posts/archive.html', context)
+
+
+def _with_comment_total(archived_posts):
+    return archived_posts.select_related('author', 'group').annotate(
+        comment_total=Count('comments'))
+
+
+def _render_fragment(queryset, archive, request):
+    """Только карточки постов: без base.html и контекст-процессоров."""
+    context = get_cursor_page(
+        queryset, request, _with_comment_total(archive))
+    context['posts'] = cards.as_cards(context['posts'])
+    response = HttpResponse(
+        render_to_string('posts/includes/post_cards.html', context))
+    if context['next_cursor'] is not None:
+        response['X-Next-Cursor'] = context['next_cursor']
+    return response
+
+
+@stale_cache_page(20, key_prefix='index_fragment')
+def index_fragment(request):
+    return _render_fragment(
+        PostCard.objects.all(), ArchivedPost.objects.all(), request)
+
+
+def group_fragment(request, slug):
+    group = lookups.get_group_or_404(slug)
+    return _render_fragment(
+        group.post_cards.all(), group.archived_posts.all(), request)
+
+
+def profile_fragment(request, username):
+    author = lookups.get_user_or_404(username)
+    return _render_fragment(
+        author.post_cards.all(), author.archived_posts.all(), request)
+
+
+@login_required
+def follow_fragment(request):
+    return _render_fragment(
+        PostCard.objects.filter(author__following__user=request.user),
+        ArchivedPost.objects.filter(author__following__user=request.user),
+        request)
+
+
+feed_rss = feeds.cached_feed(feeds.LatestPostsFeed(), lambda: {})
+feed_atom = feeds.cached_feed(feeds.LatestPostsAtomFeed(), lambda: {})
+group_feed_rss = feeds.cached_feed(
+    feeds.GroupPostsFeed(), lambda slug: {'group__slug': slug})
+group_feed_atom = feeds.cached_feed(
+    feeds.GroupPostsAtomFeed(), lambda slug: {'group__slug': slug})
+profile_feed_rss = feeds.cached_feed(
+    feeds.AuthorPostsFeed(), lambda username: {'author__username': username})
+profile_feed_atom = feeds.cached_feed(
+    feeds.AuthorPostsAtomFeed(),
+    lambda username: {'author__username': username})
+
+
+def _sitemap_response(name, encoding=None):
+    """Готовый файл карты сайта с явными заголовками.
+
+    static.serve годится только для разработки, а тип .xml.gz он
+    определял бы как архив.
+    """
+    try:
+        stream = open(os.path.join(settings.SITEMAP_ROOT, name), 'rb')
+    except FileNotFoundError:
+        raise Http404
+    response = FileResponse(
+        stream, content_type='application/xml; charset=utf-8')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Last-Modified'] = http_date(os.fstat(stream.fileno()).st_mtime)
+    return response
+
+
+def sitemap_index(request):
+    return _sitemap_response(sitemaps.INDEX_NAME)
+
+
+def sitemap_shard(request, name):
+    if not sitemaps.SHARD_NAME.fullmatch(name):
+        raise Http404
+    return _sitemap_response(name, encoding='gzip')
+
+
+def robots_txt(request):
+    return render(
+        request, 'posts/robots.txt',
+        {'sitemap_url': settings.SITE_URL + reverse('posts:sitemap_index')},
+        content_type='text/plain')
@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from . import deletion
+from .models import UserDeletion
+
+User = get_user_model()
+
+
+class DeferredDeleteUserAdmin(UserAdmin):
+    """Пользователи удаляются только фоновой задачей по пачкам:
+    каскад по всем постам автора в одной транзакции блокирует базу."""
+
+    actions = ['schedule_deletion']
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def schedule_deletion(self, request, queryset):
+        for user in queryset:
+            deletion.schedule_deletion(user)
+        self.message_user(
+            request, f'Отправлено на удаление: {len(queryset)}')
+    schedule_deletion.short_description = 'Удалить в фоновом режиме'
+    schedule_deletion.allowed_permissions = ('change',)
+
+
+class UserDeletionAdmin(admin.ModelAdmin):
+    list_display = ('username', 'stage', 'deleted_comments',
+                    'deleted_follows', 'deleted_notifications',
+                    'deleted_posts', 'requested', 'finished')
+    list_filter = ('stage',)
+    readonly_fields = ('user', 'username', 'stage', 'deleted_comments',
+                       'deleted_follows', 'deleted_notifications',
+                       'deleted_posts', 'finished')
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.unregister(User)
+admin.site.register(User, DeferredDeleteUserAdmin)
+
+admin.site.register(UserDeletion, UserDeletionAdmin)
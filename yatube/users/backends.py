@@ -0,0 +1,30 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+# С LocMemCache у каждого процесса своя копия, и сигналы сбрасывают её
+# только там, где пользователя изменили: остальные обработчики узнают о
+# смене пароля или блокировке не позже чем через это время.
+USER_CACHE_TIMEOUT = 5
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    Хеш сессии по-прежнему сверяется в django.contrib.auth.get_user, а
+    запись сбрасывается при сохранении пользователя (в том числе при смене
+    пароля) и при выходе. Копия живёт несколько секунд, после чего хеш
+    сессии и is_active снова проверяются по базе.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.jobs import task
+from posts import notifications
+from posts.models import (ArchivedComment, ArchivedPost, Comment, Follow,
+                          Notification, Post)
+
+from .models import UserDeletion
+
+User = get_user_model()
+
+DELETION_BATCH_SIZE = 500
+STAGES = [stage for stage, _ in UserDeletion.STAGE_CHOICES]
+
+
+def schedule_deletion(user):
+    """Сразу отключает пользователя, а его данные удаляет фоновая задача."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        deletion, created = UserDeletion.objects.get_or_create(
+            user=user, defaults={'username': user.username})
+        if created:
+            delete_user_batch.delay(deletion.pk)
+    return deletion
+
+
+def _stage_rows(deletion):
+    user_id = deletion.user_id
+    return {
+        UserDeletion.STAGE_COMMENTS: (
+            Comment.objects.filter(author_id=user_id), 'deleted_comments'),
+        UserDeletion.STAGE_POST_COMMENTS: (
+            Comment.objects.filter(post__author_id=user_id),
+            'deleted_comments'),
+        UserDeletion.STAGE_ARCHIVED_COMMENTS: (
+            ArchivedComment.objects.filter(author_id=user_id),
+            'deleted_comments'),
+        UserDeletion.STAGE_ARCHIVED_POST_COMMENTS: (
+            ArchivedComment.objects.filter(post__author_id=user_id),
+            'deleted_comments'),
+        UserDeletion.STAGE_FOLLOWS: (
+            Follow.objects.filter(Q(user_id=user_id) | Q(author_id=user_id)),
+            'deleted_follows'),
+        UserDeletion.STAGE_POST_NOTIFICATIONS: (
+            Notification.objects.filter(post__author_id=user_id),
+            'deleted_notifications'),
+        UserDeletion.STAGE_NOTIFICATIONS: (
+            Notification.objects.filter(recipient_id=user_id),
+            'deleted_notifications'),
+        UserDeletion.STAGE_POSTS: (
+            Post.objects.filter(author_id=user_id), 'deleted_posts'),
+        UserDeletion.STAGE_ARCHIVED_POSTS: (
+            ArchivedPost.objects.filter(author_id=user_id), 'deleted_posts'),
+    }[deletion.stage]
+
+
+def run_batch(deletion, batch_size=DELETION_BATCH_SIZE):
+    """Выполняет одну пачку текущего этапа в своей транзакции.
+
+    Счётчики и этап сохраняются вместе с удалением, поэтому прерванную
+    работу можно продолжить с того же места. Возвращает False, когда
+    удалять больше нечего.
+    """
+    if deletion.stage == UserDeletion.STAGE_DONE:
+        return False
+    rows = UserDeletion.objects.filter(pk=deletion.pk)
+    unread_keys = []
+    with transaction.atomic():
+        if deletion.stage == UserDeletion.STAGE_USER:
+            # Посты, комментарии и уведомления уже удалены, каскад
+            # остаётся небольшим.
+            User.objects.filter(pk=deletion.user_id).delete()
+            rows.update(stage=UserDeletion.STAGE_DONE,
+                        finished=timezone.now())
+        else:
+            queryset, counter = _stage_rows(deletion)
+            ids = list(queryset.order_by('pk').values_list(
+                'pk', flat=True)[:batch_size])
+            if ids:
+                batch = queryset.model.objects.filter(pk__in=ids)
+                if queryset.model is Notification:
+                    unread_keys = notifications.unread_keys(batch)
+                _, deleted = batch.delete()
+                rows.update(**{counter: F(counter) + deleted.get(
+                    queryset.model._meta.label, 0)})
+            else:
+                rows.update(stage=STAGES[STAGES.index(deletion.stage) + 1])
+    cache.delete_many(unread_keys)
+    deletion.refresh_from_db()
+    return deletion.stage != UserDeletion.STAGE_DONE
+
+
+@task()
+def delete_user_batch(deletion_id):
+    """Одна пачка удаления; следующая ставится отдельной задачей."""
+    deletion = UserDeletion.objects.filter(pk=deletion_id).first()
+    if deletion is not None and run_batch(deletion):
+        delete_user_batch.delay(deletion_id)
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users import deletion as user_deletion
+from users.models import UserDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет данные пользователей, отправленных на удаление, '
+        'небольшими пачками. Прерванную работу можно продолжить.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=user_deletion.DELETION_BATCH_SIZE)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах, чтобы пропустить '
+                 'другие записи в базу.')
+
+    def handle(self, *args, **options):
+        pending = UserDeletion.objects.exclude(
+            stage=UserDeletion.STAGE_DONE)
+        for deletion in pending:
+            stage = deletion.stage
+            while user_deletion.run_batch(deletion, options['batch_size']):
+                if deletion.stage != stage:
+                    self.report(deletion)
+                    stage = deletion.stage
+                if options['pause']:
+                    time.sleep(options['pause'])
+            self.report(deletion)
+
+    def report(self, deletion):
+        self.stdout.write(
+            f'{deletion.username}: {deletion.get_stage_display()}, '
+            f'удалено комментариев {deletion.deleted_comments}, '
+            f'подписок {deletion.deleted_follows}, '
+            f'уведомлений {deletion.deleted_notifications}, '
+            f'постов {deletion.deleted_posts}')
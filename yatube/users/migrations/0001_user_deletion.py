@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDeletion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150, verbose_name='имя')),
+                ('stage', models.CharField(choices=[('comments', 'комментарии пользователя'), ('post_comments', 'комментарии к постам пользователя'), ('follows', 'подписки'), ('posts', 'посты'), ('user', 'пользователь'), ('done', 'готово')], db_index=True, default='comments', max_length=20, verbose_name='этап')),
+                ('deleted_comments', models.PositiveIntegerField(default=0, verbose_name='удалено комментариев')),
+                ('deleted_follows', models.PositiveIntegerField(default=0, verbose_name='удалено подписок')),
+                ('deleted_posts', models.PositiveIntegerField(default=0, verbose_name='удалено постов')),
+                ('requested', models.DateTimeField(auto_now_add=True, verbose_name='дата запроса')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='дата завершения')),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion', to=settings.AUTH_USER_MODEL, verbose_name='пользователь')),
+            ],
+            options={
+                'ordering': ['requested'],
+            },
+        ),
+    ]
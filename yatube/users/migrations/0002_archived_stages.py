@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_user_deletion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userdeletion',
+            name='stage',
+            field=models.CharField(choices=[('comments', 'комментарии пользователя'), ('post_comments', 'комментарии к постам пользователя'), ('archived_comments', 'архивные комментарии пользователя'), ('archived_post_comments', 'архивные комментарии к постам пользователя'), ('follows', 'подписки'), ('posts', 'посты'), ('archived_posts', 'архивные посты'), ('user', 'пользователь'), ('done', 'готово')], db_index=True, default='comments', max_length=20, verbose_name='этап'),
+        ),
+    ]
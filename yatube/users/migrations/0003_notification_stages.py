@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_archived_stages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdeletion',
+            name='deleted_notifications',
+            field=models.PositiveIntegerField(default=0, verbose_name='удалено уведомлений'),
+        ),
+        migrations.AlterField(
+            model_name='userdeletion',
+            name='stage',
+            field=models.CharField(choices=[('comments', 'комментарии пользователя'), ('post_comments', 'комментарии к постам пользователя'), ('archived_comments', 'архивные комментарии пользователя'), ('archived_post_comments', 'архивные комментарии к постам пользователя'), ('follows', 'подписки'), ('post_notifications', 'уведомления о постах пользователя'), ('notifications', 'уведомления пользователя'), ('posts', 'посты'), ('archived_posts', 'архивные посты'), ('user', 'пользователь'), ('done', 'готово')], db_index=True, default='comments', max_length=20, verbose_name='этап'),
+        ),
+    ]
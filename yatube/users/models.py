@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class UserDeletion(models.Model):
+    STAGE_COMMENTS = 'comments'
+    STAGE_POST_COMMENTS = 'post_comments'
+    STAGE_ARCHIVED_COMMENTS = 'archived_comments'
+    STAGE_ARCHIVED_POST_COMMENTS = 'archived_post_comments'
+    STAGE_FOLLOWS = 'follows'
+    STAGE_POST_NOTIFICATIONS = 'post_notifications'
+    STAGE_NOTIFICATIONS = 'notifications'
+    STAGE_POSTS = 'posts'
+    STAGE_ARCHIVED_POSTS = 'archived_posts'
+    STAGE_USER = 'user'
+    STAGE_DONE = 'done'
+    STAGE_CHOICES = (
+        (STAGE_COMMENTS, 'комментарии пользователя'),
+        (STAGE_POST_COMMENTS, 'комментарии к постам пользователя'),
+        (STAGE_ARCHIVED_COMMENTS, 'архивные комментарии пользователя'),
+        (STAGE_ARCHIVED_POST_COMMENTS,
+         'архивные комментарии к постам пользователя'),
+        (STAGE_FOLLOWS, 'подписки'),
+        (STAGE_POST_NOTIFICATIONS, 'уведомления о постах пользователя'),
+        (STAGE_NOTIFICATIONS, 'уведомления пользователя'),
+        (STAGE_POSTS, 'посты'),
+        (STAGE_ARCHIVED_POSTS, 'архивные посты'),
+        (STAGE_USER, 'пользователь'),
+        (STAGE_DONE, 'готово'),
+    )
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deletion',
+        verbose_name='пользователь'
+    )
+    username = models.CharField(max_length=150, verbose_name='имя')
+    stage = models.CharField(
+        max_length=20, choices=STAGE_CHOICES, default=STAGE_COMMENTS,
+        db_index=True, verbose_name='этап')
+    deleted_comments = models.PositiveIntegerField(
+        default=0, verbose_name='удалено комментариев')
+    deleted_follows = models.PositiveIntegerField(
+        default=0, verbose_name='удалено подписок')
+    deleted_notifications = models.PositiveIntegerField(
+        default=0, verbose_name='удалено уведомлений')
+    deleted_posts = models.PositiveIntegerField(
+        default=0, verbose_name='удалено постов')
+    requested = models.DateTimeField(
+        auto_now_add=True, verbose_name='дата запроса')
+    finished = models.DateTimeField(
+        null=True, blank=True, verbose_name='дата завершения')
+
+    class Meta:
+        ordering = ['requested']
+
+    def __str__(self):
+        return f'{self.username}: {self.get_stage_display()}'
@@ -0,0 +1 @@
+from .deletion import delete_user_batch  # noqa: F401
@@ -0,0 +1,107 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from posts import notifications
+from posts.models import (ArchiveMonth, Comment, Follow, Group, GroupStats,
+                          Notification, Post)
+from users import deletion
+from users.models import UserDeletion
+
+User = get_user_model()
+
+
+class UserDeletionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='leaving')
+        self.other = User.objects.create_user(username='staying')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        self.posts = [
+            Post.objects.create(
+                text=f'Пост {i}', author=self.user, group=self.group)
+            for i in range(3)
+        ]
+        self.kept = Post.objects.create(text='Чужой', author=self.other)
+        Comment.objects.create(
+            post=self.kept, author=self.user, text='Мой комментарий')
+        Comment.objects.create(
+            post=self.posts[0], author=self.other, text='Чужой комментарий')
+        Follow.objects.create(user=self.user, author=self.other)
+        Follow.objects.create(user=self.other, author=self.user)
+
+    def test_schedule_deactivates_user(self):
+        """Пользователь отключается сразу, а данные пока остаются."""
+        deletion.schedule_deletion(self.user)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+
+    def test_batches_are_resumable(self):
+        """Каждая пачка сохраняет прогресс, работу можно продолжить."""
+        record = deletion.schedule_deletion(self.user)
+        deletion.run_batch(record, batch_size=1)
+        self.assertEqual(record.deleted_comments, 1)
+        record = UserDeletion.objects.get(pk=record.pk)
+        while deletion.run_batch(record, batch_size=2):
+            pass
+        self.assertEqual(record.stage, UserDeletion.STAGE_DONE)
+        self.assertEqual(record.deleted_comments, 2)
+        self.assertEqual(record.deleted_follows, 2)
+        self.assertEqual(record.deleted_posts, 3)
+        self.assertIsNotNone(record.finished)
+        self.assertFalse(User.objects.filter(username='leaving').exists())
+        self.assertTrue(Post.objects.filter(pk=self.kept.pk).exists())
+
+    def test_notifications_deleted_in_batches(self):
+        """Уведомления удаляются своими этапами, счётчик получателя сброшен."""
+        cache.clear()
+        Notification.objects.create(recipient=self.other, post=self.posts[0])
+        Notification.objects.create(recipient=self.other, post=self.posts[1])
+        Notification.objects.create(recipient=self.user, post=self.kept)
+        self.assertEqual(notifications.unread_count(self.other.pk), 2)
+        record = deletion.schedule_deletion(self.user)
+        while record.stage != UserDeletion.STAGE_POSTS:
+            deletion.run_batch(record, batch_size=1)
+        self.assertEqual(record.deleted_notifications, 3)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(notifications.unread_count(self.other.pk), 0)
+
+    def test_stats_follow_deleted_posts(self):
+        """Посты удаляются с сигналами, счётчики групп и архива сходятся."""
+        deletion.schedule_deletion(self.user)
+        call_command('delete_users', '--batch-size=2', stdout=StringIO())
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 0)
+        self.assertFalse(ArchiveMonth.objects.filter(
+            scope=ArchiveMonth.SCOPE_AUTHOR, scope_id=self.user.pk).exists())
+        self.assertEqual(
+            ArchiveMonth.objects.get(scope=ArchiveMonth.SCOPE_ALL).post_count,
+            1)
+
+    def test_command_reports_progress(self):
+        deletion.schedule_deletion(self.user)
+        out = StringIO()
+        call_command('delete_users', stdout=out)
+        self.assertIn('leaving: готово', out.getvalue())
+        self.assertIn('постов 3', out.getvalue())
+
+    def test_admin_action(self):
+        """В admin пользователь удаляется действием, а не каскадом."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        self.client.force_login(admin)
+        response = self.client.post(
+            reverse('admin:auth_user_changelist'),
+            {'action': 'schedule_deletion', '_selected_action': [
+                self.user.pk]})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            UserDeletion.objects.filter(user=self.user).exists())
+        response = self.client.get(
+            reverse('admin:auth_user_delete', args=(self.user.pk,)))
+        self.assertEqual(response.status_code, 403)
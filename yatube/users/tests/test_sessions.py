@@ -0,0 +1,73 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from users.backends import user_cache_key
+
+User = get_user_model()
+
+ABOUT_URL = reverse('about:author')
+
+
+class CachedSessionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', password='Старый-пароль-1')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_warm_request_has_no_queries(self):
+        """Сессия и пользователь берутся из кеша без запросов к базе."""
+        self.client.get(ABOUT_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(ABOUT_URL)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_invalidates_cached_user(self):
+        """После смены пароля кеш сброшен, а новая сессия остаётся входом."""
+        self.client.get(ABOUT_URL)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.client.post(reverse('users:password_change'), {
+            'old_password': 'Старый-пароль-1',
+            'new_password1': 'Новый-пароль-2',
+            'new_password2': 'Новый-пароль-2',
+        })
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.client.get(ABOUT_URL)
+        self.assertTrue(response.context['user'].is_authenticated)
+
+    def test_other_sessions_end_after_password_change(self):
+        """Чужая сессия не переживает смену пароля из-за кеша."""
+        other_client = Client()
+        other_client.force_login(self.user)
+        other_client.get(ABOUT_URL)
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('Новый-пароль-2')
+        user.save()
+        response = other_client.get(ABOUT_URL)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_logout_forgets_user(self):
+        self.client.get(ABOUT_URL)
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_cached_user_expires_quickly(self):
+        """Блокировка в другом процессе действует после короткой паузы."""
+        self.client.get(ABOUT_URL)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(ABOUT_URL)
+        self.assertTrue(response.context['user'].is_authenticated)
+        later = time.time() + 10
+        with mock.patch('time.time', return_value=later):
+            response = self.client.get(ABOUT_URL)
+        self.assertFalse(response.context['user'].is_authenticated)
@@ -52,11 +52,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware'
@@ -77,6 +79,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.notifications.unread_notifications',
             ],
         },
     },
@@ -92,6 +95,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Тесты run_workers пишут в базу из нескольких потоков: у файловой
+        # базы есть ожидание блокировки, у общей базы в памяти его нет.
+        'TEST': {'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3')},
     }
 }
 
@@ -137,10 +143,32 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма копятся в OutboxMessage, а отправляет их команда send_outbox
+# через OUTBOX_EMAIL_BACKEND.
+EMAIL_BACKEND = 'core.mail.OutboxEmailBackend'
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+# Очереди фоновых задач и сколько задач каждой может выполняться
+# одновременно во всех обработчиках run_workers.
+JOB_QUEUES = {
+    'default': 2,
+    'media': 2,
+    'mail': 1,
+}
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITE_URL = 'https://rustammul.pythonanywhere.com'
+# Сюда ProfilingMiddleware пишет результаты профилирования запросов.
+PROFILING_ROOT = os.path.join(BASE_DIR, 'profiles')
+
+# Запросы к базе дольше порога попадают в журнал и буфер в admin.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_BUFFER_SIZE = 200
+
+# Учёт времени отрисовки по шаблонам и тегам; результат — в __metrics__/.
+TEMPLATE_PROFILING = False
 
 CACHES = {
     'default': {
@@ -148,6 +176,11 @@ CACHES = {
     }
 }
 
+# Сессии читаются из кеша, а база трогается только при записи и промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
 INTERNAL_IPS = [
@@ -18,13 +18,26 @@ from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core import views as core_views
+
 urlpatterns = [
     path('', include('posts.urls', namespace="posts")),
     path('groups/', include('posts.urls', namespace="groups")),
+    path(
+        'admin/slow-queries/',
+        core_views.slow_queries,
+        name='slow_queries'
+    ),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path(
+        '__profiles__/<str:name>',
+        core_views.profiling_result,
+        name='profiling_result'
+    ),
+    path('__metrics__/', core_views.metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG: